@@ -2,10 +2,10 @@ import json
 import hashlib
 from datetime import datetime
 import uuid
+from enforcement_provenance.ledger import load_ledger_entries
 
 def add_ledger_entry(file_path, entry_type, trace_id, details):
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    data = load_ledger_entries(file_path)
     
     # Get last hash
     prev_hash = data[-1]['hash'] if data else "GENESIS"
@@ -31,9 +31,10 @@ def add_ledger_entry(file_path, entry_type, trace_id, details):
     # Add to data
     data.append(new_entry)
     
-    # Write back
+    # Write back as JSON Lines, the format EnforcementLedger appends to
     with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+        for entry in data:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
     
     return new_entry["hash"]
 
@@ -3,6 +3,7 @@ Standard Section Object Schema
 """
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
+from functools import cached_property
 from enum import Enum
 
 
@@ -36,6 +37,11 @@ class Section:
         if self.metadata is None:
             self.metadata = {}
 
+    @cached_property
+    def text_lower(self) -> str:
+        """Lowercased section text, computed once for repeated keyword searches"""
+        return self.text.lower()
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert Section object to dictionary with standard schema"""
         result = asdict(self)
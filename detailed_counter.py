@@ -3,61 +3,153 @@
 Detailed Section Counter
 Properly counts all sections in nested JSON structures
 """
+import heapq
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-def count_sections_in_file(filename, data):
-    """Count sections in a single file with detailed structure analysis"""
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Files above this size are streamed instead of fully parsed
+STREAMING_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+# Counting only inspects the root, its children and their children
+SKELETON_DEPTH = 2
+
+# Section-style keys such as "302", "1.1" or "498A": digits once any
+# '.', 'A' and 'B' characters are dropped
+_SECTION_KEY_STRIP = str.maketrans('', '', '.AB')
+
+def _is_section_key(key):
+    return key.translate(_SECTION_KEY_STRIP).isdigit()
+
+def _count_categories(categories, prefix):
+    """Count sections across a mapping of category -> sections dict"""
+    category_dicts = {category: v for category, v in categories.items() if isinstance(v, dict)}
+    sections = sum(map(len, category_dicts.values()))
+    acts = {f"{prefix}_{category}" for category in category_dicts}
+    structure_info = [f"{prefix} {category}: {len(v)} sections" for category, v in category_dicts.items()]
+    return sections, acts, structure_info
+
+def _handle_ipc(data):
+    """IPC structure: categories under "key_sections" """
+    return _count_categories(data["key_sections"], "IPC")
+
+def _handle_bns(data):
+    """BNS structure: categories under "structure" """
+    return _count_categories(data["structure"], "BNS")
+
+def _handle_direct(data):
+    """Direct sections structure: a list or dict under "sections" """
+    sections = 0
+    acts = set()
+    if isinstance(data["sections"], list):
+        sections = len(data["sections"])
+        acts.add("direct_sections")
+    elif isinstance(data["sections"], dict):
+        sections = len(data["sections"])
+        acts.add("sections_dict")
+    return sections, acts, []
+
+def _handle_generic(data):
+    """Unknown schema: look for section-like dicts and lists at the top level"""
     sections = 0
     acts = set()
     structure_info = []
-    
+    for key, value in data.items():
+        if isinstance(value, dict):
+            # Check if it's a section-like structure
+            # JSON object keys are always strings, so the keys need no
+            # isinstance filter before the key check
+            if all(map(_is_section_key, value)):
+                sections += len(value)
+                acts.add(key)
+                structure_info.append(f"{key}: {len(value)} sections")
+        elif isinstance(value, list):
+            sections += len(value)
+            acts.add(key)
+            structure_info.append(f"{key}: {len(value)} sections")
+    return sections, acts, structure_info
+
+# Known schemas keyed by their marker key, checked in priority order
+_SCHEMA_HANDLERS = {
+    "key_sections": _handle_ipc,
+    "structure": _handle_bns,
+    "sections": _handle_direct,
+}
+
+def count_sections_in_file(filename, data):
+    """Count sections in a single file with detailed structure analysis"""
     if isinstance(data, dict):
-        if "key_sections" in data:
-            # IPC structure
-            for category, category_sections in data["key_sections"].items():
-                if isinstance(category_sections, dict):
-                    sections += len(category_sections)
-                    acts.add(f"IPC_{category}")
-                    structure_info.append(f"IPC {category}: {len(category_sections)} sections")
-        
-        elif "structure" in data:
-            # BNS structure
-            for category, category_sections in data["structure"].items():
-                if isinstance(category_sections, dict):
-                    sections += len(category_sections)
-                    acts.add(f"BNS_{category}")
-                    structure_info.append(f"BNS {category}: {len(category_sections)} sections")
-        
-        elif "sections" in data:
-            # Direct sections structure
-            if isinstance(data["sections"], list):
-                sections = len(data["sections"])
-                acts.add("direct_sections")
-            elif isinstance(data["sections"], dict):
-                sections = len(data["sections"])
-                acts.add("sections_dict")
-        
-        else:
-            # Check for other patterns
-            for key, value in data.items():
-                if isinstance(value, dict):
-                    # Check if it's a section-like structure
-                    if all(k.isdigit() or k.replace('.', '').replace('A', '').replace('B', '').isdigit() 
-                           for k in value.keys() if isinstance(k, str)):
-                        sections += len(value)
-                        acts.add(key)
-                        structure_info.append(f"{key}: {len(value)} sections")
-                elif isinstance(value, list):
-                    sections += len(value)
-                    acts.add(key)
-                    structure_info.append(f"{key}: {len(value)} sections")
+        for key, handler in _SCHEMA_HANDLERS.items():
+            if key in data:
+                return handler(data)
+        return _handle_generic(data)
     
-    elif isinstance(data, list):
-        sections = len(data)
-        acts.add("list_structure")
+    if isinstance(data, list):
+        return len(data), {"list_structure"}, []
     
-    return sections, acts, structure_info
+    return 0, set(), []
+
+def _load_skeleton(f, max_depth=SKELETON_DEPTH):
+    """Stream a JSON file into a skeleton that keeps containers up to max_depth.
+    
+    Dict keys and list lengths are preserved down to max_depth; anything deeper
+    (the section bodies themselves) and all scalars are replaced with None, so
+    memory stays proportional to the number of sections rather than file size.
+    """
+    root = None
+    stack = []  # [container or None, pending map key]
+    
+    def attach(value):
+        nonlocal root
+        if not stack:
+            root = value
+            return
+        parent, key = stack[-1]
+        if isinstance(parent, dict):
+            parent[key] = value
+        elif isinstance(parent, list):
+            parent.append(value)
+    
+    for _, event, value in ijson.parse(f):
+        if event == 'map_key':
+            stack[-1][1] = value
+        elif event in ('start_map', 'start_array'):
+            if len(stack) > max_depth:
+                node = None
+            else:
+                node = {} if event == 'start_map' else []
+            stack.append([node, None])
+        elif event in ('end_map', 'end_array'):
+            node, _ = stack.pop()
+            attach(node)
+        else:
+            attach(None)
+    
+    return root
+
+def _load_for_counting(filepath):
+    """Load a file for counting, streaming it when it is large"""
+    if IJSON_AVAILABLE and os.path.getsize(filepath) > STREAMING_THRESHOLD_BYTES:
+        with open(filepath, 'rb') as f:
+            return _load_skeleton(f)
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _process_one(filepath):
+    """Parse and count a single file; runs inside a worker process"""
+    filename = os.path.basename(filepath)
+    try:
+        data = _load_for_counting(filepath)
+        sections, acts, structure_info = count_sections_in_file(filename, data)
+        return filename, sections, acts, structure_info, None
+    except Exception as e:
+        return filename, 0, set(), [], e
 
 def detailed_count():
     """Perform detailed count of all sections"""
@@ -65,39 +157,48 @@ def detailed_count():
     total_sections = 0
     total_acts = set()
     file_details = []
+    empty_files = []
     
     print("DETAILED SECTION COUNTING")
     print("=" * 60)
     
-    for filename in sorted(os.listdir(db_path)):
-        if filename.endswith('.json'):
-            filepath = os.path.join(db_path, filename)
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                sections, acts, structure_info = count_sections_in_file(filename, data)
-                total_sections += sections
-                total_acts.update(acts)
-                
-                file_details.append({
-                    'filename': filename,
-                    'sections': sections,
-                    'acts': len(acts),
-                    'structure_info': structure_info
-                })
-                
-                print(f"\n{filename}:")
-                print(f"  Sections: {sections}")
-                print(f"  Acts/Categories: {len(acts)}")
-                if structure_info:
-                    for info in structure_info[:5]:  # Show first 5
-                        print(f"    - {info}")
-                    if len(structure_info) > 5:
-                        print(f"    ... and {len(structure_info) - 5} more categories")
-                
-            except Exception as e:
-                print(f"Error processing {filename}: {e}")
+    filepaths = [
+        os.path.join(db_path, filename)
+        for filename in sorted(os.listdir(db_path))
+        if filename.endswith('.json')
+    ]
+    
+    # Files are independent and parsing is CPU-bound, so fan out across processes.
+    # executor.map yields results in input order, keeping the output sorted.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(_process_one, filepaths))
+    
+    for filename, sections, acts, structure_info, error in results:
+        if error is not None:
+            print(f"Error processing {filename}: {error}")
+            continue
+        
+        total_sections += sections
+        total_acts.update(acts)
+        
+        file_info = {
+            'filename': filename,
+            'sections': sections,
+            'acts': len(acts),
+            'structure_info': structure_info
+        }
+        file_details.append(file_info)
+        if sections == 0:
+            empty_files.append(file_info)
+        
+        print(f"\n{filename}:")
+        print(f"  Sections: {sections}")
+        print(f"  Acts/Categories: {len(acts)}")
+        if structure_info:
+            for info in structure_info[:5]:  # Show first 5
+                print(f"    - {info}")
+            if len(structure_info) > 5:
+                print(f"    ... and {len(structure_info) - 5} more categories")
     
     print(f"\n{'='*60}")
     print("FINAL TOTALS:")
@@ -107,12 +208,11 @@ def detailed_count():
     
     # Top files by sections
     print(f"\nTOP FILES BY SECTIONS:")
-    sorted_files = sorted(file_details, key=lambda x: x['sections'], reverse=True)
-    for i, file_info in enumerate(sorted_files[:10], 1):
+    top_files = heapq.nlargest(10, file_details, key=lambda x: x['sections'])
+    for i, file_info in enumerate(top_files, 1):
         print(f"  {i:2}. {file_info['filename']:<35} - {file_info['sections']:,} sections")
     
     # Files with no sections
-    empty_files = [f for f in file_details if f['sections'] == 0]
     if empty_files:
         print(f"\nFILES WITH NO SECTIONS ({len(empty_files)}):")
         for file_info in empty_files:
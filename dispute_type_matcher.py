@@ -1,5 +1,27 @@
 import json
 import os
+import re
+
+BANKING_KEYWORDS = frozenset({'bank', 'deposit', 'fd', 'account', 'cheque', 'loan', 'credit card'})
+INSURANCE_KEYWORDS = frozenset({'insurance', 'policy', 'claim', 'premium'})
+MEDICAL_KEYWORDS = frozenset({'doctor', 'hospital', 'medical', 'treatment', 'surgery', 'negligence'})
+CONSUMER_KEYWORDS = frozenset({'defective', 'product', 'warranty', 'consumer', 'refund'})
+EMPLOYMENT_KEYWORDS = frozenset({'salary', 'fired', 'termination', 'employer', 'workplace'})
+
+
+def _compile_keywords(keywords):
+    """Compile a keyword set into one alternation; matching stays substring-based"""
+    return re.compile('|'.join(re.escape(word) for word in sorted(keywords)))
+
+
+# Checked in order; the first dispute type with a matching keyword wins
+_DISPUTE_PATTERNS = (
+    ('banking_disputes', _compile_keywords(BANKING_KEYWORDS)),
+    ('insurance_disputes', _compile_keywords(INSURANCE_KEYWORDS)),
+    ('medical_negligence', _compile_keywords(MEDICAL_KEYWORDS)),
+    ('consumer_disputes', _compile_keywords(CONSUMER_KEYWORDS)),
+    ('employment_law', _compile_keywords(EMPLOYMENT_KEYWORDS)),
+)
 
 class DisputeTypeMatcher:
     def __init__(self):
@@ -12,25 +34,9 @@ class DisputeTypeMatcher:
         """Detect dispute type from query"""
         query_lower = query.lower()
         
-        # Banking disputes
-        if any(word in query_lower for word in ['bank', 'deposit', 'fd', 'account', 'cheque', 'loan', 'credit card']):
-            return 'banking_disputes'
-        
-        # Insurance disputes
-        if any(word in query_lower for word in ['insurance', 'policy', 'claim', 'premium']):
-            return 'insurance_disputes'
-        
-        # Medical negligence
-        if any(word in query_lower for word in ['doctor', 'hospital', 'medical', 'treatment', 'surgery', 'negligence']):
-            return 'medical_negligence'
-        
-        # Consumer disputes
-        if any(word in query_lower for word in ['defective', 'product', 'warranty', 'consumer', 'refund']):
-            return 'consumer_disputes'
-        
-        # Employment
-        if any(word in query_lower for word in ['salary', 'fired', 'termination', 'employer', 'workplace']):
-            return 'employment_law'
+        for dispute_type, pattern in _DISPUTE_PATTERNS:
+            if pattern.search(query_lower):
+                return dispute_type
         
         return None
     
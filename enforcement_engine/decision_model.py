@@ -3,7 +3,8 @@ Decision Model for Sovereign Enforcement Engine
 Defines the core decision types and structures for enforcement decisions
 """
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -15,6 +16,15 @@ class EnforcementDecision(Enum):
     RESTRICT = "RESTRICT"
 
 
+# Decisions under which execution may proceed. Kept as a tuple so membership
+# tests resolve on member identity instead of the enum's Python-level __hash__.
+PERMITTED_DECISIONS = (
+    EnforcementDecision.ALLOW,
+    EnforcementDecision.ALLOW_INFORMATIONAL,
+    EnforcementDecision.SAFE_REDIRECT
+)
+
+
 class PolicySource(Enum):
     CONSTITUTIONAL = "Constitutional"
     GOVERNANCE = "Governance"
@@ -33,11 +43,42 @@ class DecisionContext:
     user_request: str
     jurisdiction_routed_to: str
     trace_id: str
-    timestamp: datetime = None
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    
+    @cached_property
+    def request_lower(self) -> str:
+        """Lowercased user request, computed once and shared by all rules"""
+        return self.user_request.lower()
+    
+    @cached_property
+    def domain_lower(self) -> str:
+        """Lowercased domain, computed once and shared by all rules"""
+        return self.domain.lower()
     
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
+    @cached_property
+    def procedure_id_lower(self) -> str:
+        """Lowercased procedure id, computed once and shared by all rules"""
+        return self.procedure_id.lower()
+    
+    @cached_property
+    def timestamp_iso(self) -> str:
+        """ISO-8601 timestamp, formatted once for proof hashing"""
+        return self.timestamp.isoformat()
+    
+    @classmethod
+    def from_signal(cls, signal: "EnforcementSignal") -> "DecisionContext":
+        """Build a decision context carrying the signal's fields"""
+        return cls(
+            case_id=signal.case_id,
+            country=signal.country,
+            domain=signal.domain,
+            procedure_id=signal.procedure_id,
+            original_confidence=signal.original_confidence,
+            user_request=signal.user_request,
+            jurisdiction_routed_to=signal.jurisdiction_routed_to,
+            trace_id=signal.trace_id,
+            timestamp=signal.timestamp
+        )
 
 
 @dataclass
@@ -53,6 +94,11 @@ class EnforcementResult:
     proof_hash: str
     metadata: Optional[Dict[str, Any]] = None
     
+    @cached_property
+    def timestamp_iso(self) -> str:
+        """ISO-8601 timestamp, formatted once for signing and serialization"""
+        return self.timestamp.isoformat()
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
@@ -61,7 +107,7 @@ class EnforcementResult:
             "policy_source": self.policy_source.value,
             "reasoning_summary": self.reasoning_summary,
             "trace_id": self.trace_id,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self.timestamp_iso,
             "signed_decision_object": self.signed_decision_object,
             "proof_hash": self.proof_hash,
             "metadata": self.metadata or {}
@@ -81,8 +127,4 @@ class EnforcementSignal:
     trace_id: str
     user_feedback: Optional[str] = None
     outcome_tag: Optional[str] = None
-    timestamp: datetime = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
\ No newline at end of file
+    timestamp: datetime = field(default_factory=datetime.utcnow)
\ No newline at end of file
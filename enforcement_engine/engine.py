@@ -7,9 +7,9 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 from .decision_model import (
     EnforcementDecision, PolicySource, DecisionContext, 
-    EnforcementResult, EnforcementSignal
+    EnforcementResult, EnforcementSignal, PERMITTED_DECISIONS
 )
-from .rules import EnforcementRuleEngine
+from .rules import EnforcementRuleEngine, EvaluationTrace
 from .signer import EnforcementSigner
 
 
@@ -40,26 +40,17 @@ class SovereignEnforcementEngine:
         """Make an enforcement decision based on the signal"""
         with self._thread_lock:
             # Create decision context from signal
-            context = DecisionContext(
-                case_id=signal.case_id,
-                country=signal.country,
-                domain=signal.domain,
-                procedure_id=signal.procedure_id,
-                original_confidence=signal.original_confidence,
-                user_request=signal.user_request,
-                jurisdiction_routed_to=signal.jurisdiction_routed_to,
-                trace_id=signal.trace_id,
-                timestamp=signal.timestamp
-            )
+            context = DecisionContext.from_signal(signal)
             
             # Evaluate the context using the rule engine
-            decision = self.rule_engine.evaluate_context(context)
+            trace = self.rule_engine.evaluate_context(context)
+            decision = trace.final
             
             # Find the rule that caused the decision (for rule_id)
-            rule_id = self._get_applicable_rule_id(context, decision)
+            rule_id = self._get_applicable_rule_id(trace, decision)
             
             # Generate reasoning summary
-            reasoning_summary = self.rule_engine.get_reasoning_for_decision(context, decision)
+            reasoning_summary = self.rule_engine.get_reasoning_for_decision(trace, decision)
             
             # Calculate proof hash
             proof_hash = self.rule_engine.calculate_proof_hash(context, decision, rule_id)
@@ -93,18 +84,17 @@ class SovereignEnforcementEngine:
             
             return result
     
-    def _get_applicable_rule_id(self, context: DecisionContext, decision: EnforcementDecision) -> str:
+    def _get_applicable_rule_id(self, trace: EvaluationTrace, decision: EnforcementDecision) -> str:
         """Get the rule ID that led to this decision"""
-        for rule in self.rule_engine.rules:
-            rule_decision = rule.evaluate(context)
-            if rule_decision == decision:
+        for rule, rule_decision in trace.per_rule:
+            if rule_decision is decision:
                 return rule.rule_id
         # If no specific rule matched, return a default
         return f"DEFAULT-{decision.value}"
     
     def _get_policy_source_for_decision(self, decision: EnforcementDecision) -> PolicySource:
         """Determine the appropriate policy source for a decision"""
-        if decision in [EnforcementDecision.RESTRICT]:
+        if decision is EnforcementDecision.RESTRICT:
             return PolicySource.SYSTEM_SAFETY
         else:
             return PolicySource.GOVERNANCE
@@ -112,62 +102,53 @@ class SovereignEnforcementEngine:
     def is_execution_allowed(self, signal: EnforcementSignal) -> bool:
         """Check if execution is allowed based on enforcement decision"""
         result = self.make_enforcement_decision(signal)
-        return result.decision in [EnforcementDecision.ALLOW, EnforcementDecision.ALLOW_INFORMATIONAL, EnforcementDecision.SAFE_REDIRECT]
+        return result.decision in PERMITTED_DECISIONS
     
     def get_governed_response(self, signal: EnforcementSignal) -> Dict[str, Any]:
         """Get a governed response that includes enforcement proof"""
         result = self.make_enforcement_decision(signal)
+        summary = result.to_dict()
+        
+        enforcement_metadata = {
+            "rule_id": summary["rule_id"],
+            "policy_source": summary["policy_source"],
+            "reasoning": summary["reasoning_summary"]
+        }
+        trace_proof = self.signer.create_enforcement_proof(result)
         
-        if result.decision in [EnforcementDecision.ALLOW, EnforcementDecision.ALLOW_INFORMATIONAL, EnforcementDecision.SAFE_REDIRECT]:
+        if result.decision in PERMITTED_DECISIONS:
             # Execution is allowed, return success response with proof
             return {
                 "status": "allowed",
-                "decision": result.decision.value,
-                "trace_proof": self.signer.create_enforcement_proof(result),
-                "enforcement_metadata": {
-                    "rule_id": result.rule_id,
-                    "policy_source": result.policy_source.value,
-                    "reasoning": result.reasoning_summary
-                }
+                "decision": summary["decision"],
+                "trace_proof": trace_proof,
+                "enforcement_metadata": enforcement_metadata
             }
         else:
             # Execution is blocked, return blocked response
             return {
                 "status": "blocked",
                 "reason": "governance enforced",
-                "decision": result.decision.value,
-                "trace_proof": self.signer.create_enforcement_proof(result),
-                "enforcement_metadata": {
-                    "rule_id": result.rule_id,
-                    "policy_source": result.policy_source.value,
-                    "reasoning": result.reasoning_summary
-                }
+                "decision": summary["decision"],
+                "trace_proof": trace_proof,
+                "enforcement_metadata": enforcement_metadata
             }
     
     def enforce_rl_update(self, signal: EnforcementSignal) -> bool:
         """Enforce whether RL updates are allowed"""
         # For RL updates, we may have different rules
-        # For now, allow RL updates unless specifically blocked by safety rules
-        context = DecisionContext(
-            case_id=signal.case_id,
-            country=signal.country,
-            domain=signal.domain,
-            procedure_id=signal.procedure_id,
-            original_confidence=signal.original_confidence,
-            user_request=signal.user_request,
-            jurisdiction_routed_to=signal.jurisdiction_routed_to,
-            trace_id=signal.trace_id,
-            timestamp=signal.timestamp
-        )
-        
-        # Check specifically for safety rules that might block learning
-        for rule in self.rule_engine.rules:
-            if isinstance(rule, (EnforcementRule)):
-                decision = rule.evaluate(context)
-                if decision == EnforcementDecision.RESTRICT:
-                    # Check if this is a safety/system integrity rule
-                    if rule.policy_source in [PolicySource.SYSTEM_SAFETY]:
-                        return False
+        # For now, allow RL updates unless specifically blocked by safety rules:
+        # learning is refused only when a rule whose policy source is
+        # SYSTEM_SAFETY returned RESTRICT. Restricts from governance,
+        # constitutional or compliance rules do not block learning. The
+        # unsigned evaluation trace already holds every rule's decision, so
+        # nothing is signed here.
+        with self._thread_lock:
+            trace = self.rule_engine.evaluate_context(DecisionContext.from_signal(signal))
+        for rule, decision in trace.per_rule:
+            if (decision is EnforcementDecision.RESTRICT
+                    and rule.policy_source is PolicySource.SYSTEM_SAFETY):
+                return False
         
         return True
 
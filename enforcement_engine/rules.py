@@ -4,14 +4,128 @@ Deterministic rules engine for governance decisions
 """
 import hashlib
 import json
-from typing import List, Dict, Any
+import re
+import threading
+from json.encoder import encode_basestring_ascii
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Dict, Any, ClassVar, FrozenSet, Hashable, Optional, Tuple
 from .decision_model import EnforcementDecision, PolicySource, DecisionContext
 from raj_adapter.enforcement_integration import get_raj_enforcement_integrator
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def _prefix_regex(patterns: Tuple[str, ...]) -> str:
+    """Build a regex alternation with shared prefixes factored out.
+    
+    A flat 'a|b|c' alternation makes the backtracking engine retry every
+    literal at each position; nesting by common prefix lets it reject most
+    positions after one character.
+    """
+    trie: Dict[str, Any] = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict[str, Any]) -> str:
+        # A pattern ends here, so longer continuations cannot change whether
+        # the text matches
+        if '' in node:
+            return ''
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+    
+    return build(trie)
+
+
+class PatternMatcher:
+    """Multi-pattern substring matcher built once per pattern list.
+    
+    Uses a pyahocorasick automaton when installed, so a request is scanned
+    once for every pattern; otherwise falls back to a compiled regex with
+    shared prefixes factored out. Texts are expected to be lowercased already
+    (see DecisionContext.request_lower); re.IGNORECASE benchmarked several
+    times slower than one shared lower() call.
+    """
+    
+    __slots__ = ('patterns', '_automaton', '_regex')
+    
+    def __init__(self, patterns: List[str]):
+        self.patterns = tuple(patterns)
+        self._automaton = None
+        self._regex = re.compile(_prefix_regex(self.patterns)) if self.patterns else None
+        if AHOCORASICK_AVAILABLE and self.patterns:
+            automaton = ahocorasick.Automaton()
+            for pattern in self.patterns:
+                automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    def search(self, text: str) -> bool:
+        """Return True if any pattern occurs in text"""
+        if self._automaton is not None:
+            return next(self._automaton.iter(text), None) is not None
+        if self._regex is None:
+            return False
+        return self._regex.search(text) is not None
+
+
+def _json_value(value: Any) -> str:
+    """JSON-encode a single value exactly as json.dumps would"""
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    return json.dumps(value)
+
+
+# Canonical proof payload: the json.dumps(..., sort_keys=True) layout of the
+# proof fields, so hashes stay identical to previously issued proofs
+_PROOF_TEMPLATE = '{"case_id": %s, "country": %s, "decision": %s, "domain": %s, "rule_id": %s, "timestamp": %s}'
+
+
+class LRUCache:
+    """Small thread-safe least-recently-used cache"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class EnforcementRule:
     """Base class for enforcement rules"""
     
+    __slots__ = ('rule_id', 'policy_source', 'description')
+    
     def __init__(self, rule_id: str, policy_source: PolicySource, description: str):
         self.rule_id = rule_id
         self.policy_source = policy_source
@@ -25,49 +139,55 @@ class EnforcementRule:
 class IntentClassificationRule(EnforcementRule):
     """Rule to classify user intent and map to enforcement decision"""
     
+    __slots__ = ('_malicious_matcher', '_informational_matcher', '_advisory_matcher')
+    
+    MALICIOUS_PATTERNS: ClassVar[Tuple[str, ...]] = (
+        # Evasion patterns
+        'how to get away', 'avoid punishment', 'evade', 'escape charges',
+        'hide evidence', 'destroy evidence', 'fake', 'forge', 'bribe',
+        'how to commit', 'best way to steal', 'without getting caught',
+        # Dangerous items/weapons
+        'bomb', 'explosive', 'weapon', 'gun', 'knife attack', 'poison',
+        'how to kill', 'how to murder', 'how to harm', 'how to hurt',
+        # Hacking/cybercrime
+        'how to hack', 'break into account', 'steal password', 'crack password',
+        'phishing', 'malware', 'ransomware', 'ddos attack'
+    )
+    INFORMATIONAL_PATTERNS: ClassVar[Tuple[str, ...]] = (
+        'what is', 'what are', 'punishment for', 'penalty for', 'law on',
+        'legal definition', 'explain', 'tell me about', 'information on',
+        'sections apply', 'which law', 'is it illegal', 'is it legal'
+    )
+    ADVISORY_PATTERNS: ClassVar[Tuple[str, ...]] = (
+        'what can i do', 'what should i do', 'how to file', 'legal action',
+        'my rights', 'can i sue', 'how to proceed', 'next steps',
+        'what are my options', 'legal help', 'need help', 'happened to me',
+        'i want to file', 'i want to sue', 'how can i sue', 'i need to'
+    )
+    
     def __init__(self):
         super().__init__(
             rule_id="INTENT-001",
             policy_source=PolicySource.GOVERNANCE,
             description="Classifies user intent and enforces appropriate decision"
         )
-        self.malicious_patterns = [
-            # Evasion patterns
-            'how to get away', 'avoid punishment', 'evade', 'escape charges',
-            'hide evidence', 'destroy evidence', 'fake', 'forge', 'bribe',
-            'how to commit', 'best way to steal', 'without getting caught',
-            # Dangerous items/weapons
-            'bomb', 'explosive', 'weapon', 'gun', 'knife attack', 'poison',
-            'how to kill', 'how to murder', 'how to harm', 'how to hurt',
-            # Hacking/cybercrime
-            'how to hack', 'break into account', 'steal password', 'crack password',
-            'phishing', 'malware', 'ransomware', 'ddos attack'
-        ]
-        self.informational_patterns = [
-            'what is', 'what are', 'punishment for', 'penalty for', 'law on',
-            'legal definition', 'explain', 'tell me about', 'information on',
-            'sections apply', 'which law', 'is it illegal', 'is it legal'
-        ]
-        self.advisory_patterns = [
-            'what can i do', 'what should i do', 'how to file', 'legal action',
-            'my rights', 'can i sue', 'how to proceed', 'next steps',
-            'what are my options', 'legal help', 'need help', 'happened to me',
-            'i want to file', 'i want to sue', 'how can i sue', 'i need to'
-        ]
+        self._malicious_matcher = PatternMatcher(self.MALICIOUS_PATTERNS)
+        self._informational_matcher = PatternMatcher(self.INFORMATIONAL_PATTERNS)
+        self._advisory_matcher = PatternMatcher(self.ADVISORY_PATTERNS)
     
     def evaluate(self, context: DecisionContext) -> EnforcementDecision:
-        request_lower = context.user_request.lower()
+        request_lower = context.request_lower
         
         # Check malicious intent
-        if any(pattern in request_lower for pattern in self.malicious_patterns):
+        if self._malicious_matcher.search(request_lower):
             return EnforcementDecision.RESTRICT
         
         # Check informational intent
-        if any(pattern in request_lower for pattern in self.informational_patterns):
+        if self._informational_matcher.search(request_lower):
             return EnforcementDecision.ALLOW_INFORMATIONAL
         
         # Check advisory intent
-        if any(pattern in request_lower for pattern in self.advisory_patterns):
+        if self._advisory_matcher.search(request_lower):
             return EnforcementDecision.ALLOW
         
         # Default to SAFE_REDIRECT for ambiguous queries
@@ -77,6 +197,12 @@ class IntentClassificationRule(EnforcementRule):
 class ConstitutionalComplianceRule(EnforcementRule):
     """Rule to ensure constitutional compliance"""
     
+    __slots__ = ()
+    
+    CONSTITUTIONAL_DOMAINS: ClassVar[FrozenSet[str]] = frozenset(
+        {'constitutional', 'fundamental_rights', 'directive_principles'}
+    )
+    
     def __init__(self):
         super().__init__(
             rule_id="CONST-001",
@@ -86,7 +212,7 @@ class ConstitutionalComplianceRule(EnforcementRule):
     
     def evaluate(self, context: DecisionContext) -> EnforcementDecision:
         # Check if domain involves constitutional matters
-        if context.domain.lower() in ['constitutional', 'fundamental_rights', 'directive_principles']:
+        if context.domain_lower in self.CONSTITUTIONAL_DOMAINS:
             # Require higher confidence for constitutional matters
             if context.original_confidence < 0.8:
                 return EnforcementDecision.SAFE_REDIRECT
@@ -96,6 +222,8 @@ class ConstitutionalComplianceRule(EnforcementRule):
 class JurisdictionBoundaryRule(EnforcementRule):
     """Rule to ensure jurisdiction boundaries are respected"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             rule_id="JURIS-001",
@@ -113,33 +241,41 @@ class JurisdictionBoundaryRule(EnforcementRule):
 class SystemSafetyRule(EnforcementRule):
     """Rule for system safety concerns"""
     
+    __slots__ = ('_dangerous_matcher',)
+    
+    # Dangerous patterns that should trigger blocking
+    DANGEROUS_PATTERNS: ClassVar[Tuple[str, ...]] = (
+        'ignore all rules',
+        'disregard',
+        'bypass',
+        'override',
+        'circumvent'
+    )
+    
     def __init__(self):
         super().__init__(
             rule_id="SAFETY-001",
             policy_source=PolicySource.SYSTEM_SAFETY,
             description="Blocks requests that could compromise system integrity"
         )
-        # Dangerous patterns that should trigger blocking
-        self.dangerous_patterns = [
-            'ignore all rules',
-            'disregard',
-            'bypass',
-            'override',
-            'circumvent'
-        ]
+        self._dangerous_matcher = PatternMatcher(self.DANGEROUS_PATTERNS)
     
     def evaluate(self, context: DecisionContext) -> EnforcementDecision:
         # Check for dangerous patterns in user request
-        request_lower = context.user_request.lower()
-        for pattern in self.dangerous_patterns:
-            if pattern in request_lower:
-                return EnforcementDecision.RESTRICT
+        request_lower = context.request_lower
+        if self._dangerous_matcher.search(request_lower):
+            return EnforcementDecision.RESTRICT
         return EnforcementDecision.ALLOW
 
 
 class ConfidenceThresholdRule(EnforcementRule):
     """Rule to enforce minimum confidence thresholds"""
     
+    __slots__ = ()
+    
+    # High-stakes domains require higher confidence
+    HIGH_STAKES_DOMAINS: ClassVar[FrozenSet[str]] = frozenset({'criminal', 'constitutional', 'property'})
+    
     def __init__(self):
         super().__init__(
             rule_id="CONF-001",
@@ -149,7 +285,7 @@ class ConfidenceThresholdRule(EnforcementRule):
     
     def evaluate(self, context: DecisionContext) -> EnforcementDecision:
         # Different domains may have different confidence requirements
-        if context.domain in ['criminal', 'constitutional', 'property']:
+        if context.domain in self.HIGH_STAKES_DOMAINS:
             # High-stakes domains require higher confidence
             if context.original_confidence < 0.3:
                 return EnforcementDecision.SAFE_REDIRECT
@@ -163,6 +299,8 @@ class ConfidenceThresholdRule(EnforcementRule):
 class ProcedureIntegrityRule(EnforcementRule):
     """Rule to ensure procedural integrity"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             rule_id="PROC-001",
@@ -176,7 +314,7 @@ class ProcedureIntegrityRule(EnforcementRule):
             return EnforcementDecision.SAFE_REDIRECT
         
         # Some procedures may have special requirements
-        if 'appeal' in context.procedure_id.lower():
+        if 'appeal' in context.procedure_id_lower:
             # Appeals may require higher scrutiny
             if context.original_confidence < 0.75:
                 return EnforcementDecision.SAFE_REDIRECT
@@ -184,94 +322,141 @@ class ProcedureIntegrityRule(EnforcementRule):
         return EnforcementDecision.ALLOW
 
 
+@dataclass(frozen=True)
+class EvaluationTrace:
+    """Outcome of one rule-engine pass: the final decision plus each rule's verdict"""
+    final: EnforcementDecision
+    per_rule: Tuple[Tuple[EnforcementRule, EnforcementDecision], ...]
+
+
 class EnforcementRuleEngine:
     """Main enforcement rule engine"""
     
+    # Number of distinct request fingerprints whose outcomes are memoized
+    CACHE_SIZE = 4096
+    
+    # One rule tuple is shared by every engine. The built-in rules hold no
+    # state; the Raj rules read the process-wide raj_consumer, whose schema is
+    # loaded once at startup and never changed. Sharing (and the per-engine
+    # trace caches) stays correct only while that holds: anything that
+    # reloads the Raj schema must reset _shared_rules and call clear_cache().
+    _shared_rules: Optional[Tuple[EnforcementRule, ...]] = None
+    _rules_lock = threading.Lock()
+    
     def __init__(self):
-        self.rules: List[EnforcementRule] = [
-            IntentClassificationRule(),
-            ConstitutionalComplianceRule(),
-            JurisdictionBoundaryRule(),
-            SystemSafetyRule(),
-            ConfidenceThresholdRule(),
-            ProcedureIntegrityRule()
-        ]
+        self.rules: Tuple[EnforcementRule, ...] = self._build_rules()
+        self._trace_cache = LRUCache(self.CACHE_SIZE)
+    
+    @classmethod
+    def _build_rules(cls) -> Tuple[EnforcementRule, ...]:
+        """Build the rule set once per process and reuse it afterwards"""
+        if cls._shared_rules is None:
+            with cls._rules_lock:
+                if cls._shared_rules is None:
+                    rules: List[EnforcementRule] = [
+                        IntentClassificationRule(),
+                        ConstitutionalComplianceRule(),
+                        JurisdictionBoundaryRule(),
+                        SystemSafetyRule(),
+                        ConfidenceThresholdRule(),
+                        ProcedureIntegrityRule()
+                    ]
+                    
+                    # Add Raj's integrated rules lazily to avoid circular import
+                    try:
+                        raj_integrator = get_raj_enforcement_integrator()
+                        rules.extend(raj_integrator.get_raj_rules())
+                    except ImportError:
+                        # Raj adapter may not be available, continue without Raj rules
+                        pass
+                    
+                    cls._shared_rules = tuple(rules)
+        return cls._shared_rules
+    
+    @staticmethod
+    def _context_fingerprint(context: DecisionContext) -> Tuple:
+        """Key of every context field the rules read.
+        
+        case_id, trace_id and timestamp never influence a rule, so requests that
+        differ only in those share a cached outcome.
+        """
+        return (
+            context.country,
+            context.domain,
+            context.jurisdiction_routed_to,
+            context.procedure_id,
+            context.original_confidence,
+            context.user_request
+        )
+    
+    def clear_cache(self) -> None:
+        """Drop memoized evaluation traces (e.g. after rules change)"""
+        self._trace_cache.clear()
+    
+    def evaluate_context(self, context: DecisionContext) -> EvaluationTrace:
+        """Evaluate all rules against the context and return the evaluation trace"""
+        key = self._context_fingerprint(context)
+        trace = self._trace_cache.get(key)
+        if trace is None:
+            trace = self._evaluate_rules(context)
+            self._trace_cache.put(key, trace)
+        return trace
+    
+    def _evaluate_rules(self, context: DecisionContext) -> EvaluationTrace:
+        """Run every rule against the context and combine their verdicts.
         
-        # Add Raj's integrated rules lazily to avoid circular import
-        self._raj_rules_loaded = False
-        self._load_raj_rules_if_needed()
-    
-    def _load_raj_rules_if_needed(self):
-        if not self._raj_rules_loaded:
-            try:
-                raj_integrator = get_raj_enforcement_integrator()
-                self.rules.extend(raj_integrator.get_raj_rules())
-                self._raj_rules_loaded = True
-            except ImportError:
-                # Raj adapter may not be available, continue without Raj rules
-                pass
-    
-    def evaluate_context(self, context: DecisionContext) -> EnforcementDecision:
-        """Evaluate all rules against the context and return final decision"""
-        decisions = []
+        Rules are evaluated even after a RESTRICT, so the trace carries all
+        verdicts needed for rule attribution and reasoning.
+        """
+        per_rule = tuple((rule, rule.evaluate(context)) for rule in self.rules)
+        return EvaluationTrace(final=self._combine_decisions(per_rule), per_rule=per_rule)
+    
+    @staticmethod
+    def _combine_decisions(per_rule) -> EnforcementDecision:
+        """Reduce per-rule verdicts to the final decision"""
         intent_decision = None
+        # Strongest non-RESTRICT decision seen so far:
+        # ALLOW_INFORMATIONAL > SAFE_REDIRECT > ALLOW
+        strongest = EnforcementDecision.ALLOW
         
-        for rule in self.rules:
-            decision = rule.evaluate(context)
-            decisions.append((rule, decision))
+        for rule, decision in per_rule:
+            # If any rule returns RESTRICT, that is the decision
+            if decision is EnforcementDecision.RESTRICT:
+                return decision
             
             # Track intent classification decision separately
             if isinstance(rule, IntentClassificationRule):
                 intent_decision = decision
             
-            # If any rule returns RESTRICT, we return that decision immediately
-            if decision == EnforcementDecision.RESTRICT:
-                return decision
+            if decision is EnforcementDecision.ALLOW_INFORMATIONAL:
+                strongest = decision
+            elif decision is EnforcementDecision.SAFE_REDIRECT and strongest is EnforcementDecision.ALLOW:
+                strongest = decision
         
         # Prioritize intent classification decision if it's not ALLOW
-        if intent_decision and intent_decision != EnforcementDecision.ALLOW:
+        if intent_decision and intent_decision is not EnforcementDecision.ALLOW:
             return intent_decision
         
-        # Check for ALLOW_INFORMATIONAL
-        for rule, decision in decisions:
-            if decision == EnforcementDecision.ALLOW_INFORMATIONAL:
-                return EnforcementDecision.ALLOW_INFORMATIONAL
-        
-        # Check for SAFE_REDIRECT
-        for rule, decision in decisions:
-            if decision == EnforcementDecision.SAFE_REDIRECT:
-                return EnforcementDecision.SAFE_REDIRECT
-        
-        # Default to ALLOW if all other rules allow
-        return EnforcementDecision.ALLOW
+        return strongest
     
-    def get_reasoning_for_decision(self, context: DecisionContext, decision: EnforcementDecision) -> str:
-        """Generate reasoning summary for a decision"""
-        reasons = []
-        
-        for rule in self.rules:
-            rule_decision = rule.evaluate(context)
-            if rule_decision == decision:
-                reasons.append(rule.description)
+    def get_reasoning_for_decision(self, trace: EvaluationTrace, decision: EnforcementDecision) -> str:
+        """Generate reasoning summary for a decision from an evaluation trace"""
+        reasons = "; ".join(rule.description for rule, rule_decision in trace.per_rule if rule_decision is decision)
+        if reasons:
+            return reasons
         
-        if not reasons:
-            if decision == EnforcementDecision.ALLOW:
-                return "No enforcement rules triggered, request allowed by default"
-            else:
-                return f"No specific rule matched for {decision.value}, but decision was required"
-        
-        return "; ".join(reasons)
+        if decision is EnforcementDecision.ALLOW:
+            return "No enforcement rules triggered, request allowed by default"
+        return f"No specific rule matched for {decision.value}, but decision was required"
     
     def calculate_proof_hash(self, context: DecisionContext, decision: EnforcementDecision, rule_id: str) -> str:
         """Calculate a proof hash for the enforcement decision"""
-        data_to_hash = {
-            'case_id': context.case_id,
-            'country': context.country,
-            'domain': context.domain,
-            'decision': decision.value,
-            'rule_id': rule_id,
-            'timestamp': context.timestamp.isoformat()
-        }
-        
-        json_str = json.dumps(data_to_hash, sort_keys=True)
-        return hashlib.sha256(json_str.encode()).hexdigest()
\ No newline at end of file
+        payload = _PROOF_TEMPLATE % (
+            _json_value(context.case_id),
+            _json_value(context.country),
+            _json_value(decision.value),
+            _json_value(context.domain),
+            _json_value(rule_id),
+            _json_value(context.timestamp_iso)
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
@@ -6,10 +6,15 @@ import hmac
 import hashlib
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 from .decision_model import EnforcementResult
 
+# Shared canonical encoder; json.dumps would build a new encoder on every call
+# because of the non-default options. Output is identical to
+# json.dumps(data, sort_keys=True, default=str), so signatures stay stable.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
 
 class EnforcementSigner:
     """Handles cryptographic signing of enforcement decisions"""
@@ -18,34 +23,55 @@ class EnforcementSigner:
         if secret_key is None:
             secret_key = os.getenv('HMAC_SECRET_KEY', 'default_enforcement_key')
         self.secret_key = secret_key.encode() if isinstance(secret_key, str) else secret_key
+        # Keyed HMAC state; copied per signature so the key schedule is derived once
+        self._hmac_template = hmac.new(self.secret_key, b'', hashlib.sha256)
+    
+    def _sign_raw(self, data_bytes: bytes) -> bytes:
+        """HMAC-SHA256 of already-serialized bytes as a raw 32-byte digest"""
+        signature = self._hmac_template.copy()
+        signature.update(data_bytes)
+        return signature.digest()
     
     def sign_decision(self, decision_data: Dict[str, Any]) -> str:
         """Sign decision data using HMAC-SHA256"""
         # Convert decision data to JSON string for consistent hashing
-        json_str = json.dumps(decision_data, sort_keys=True, default=str)
-        signature = hmac.new(
-            self.secret_key,
-            json_str.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        json_bytes = _CANONICAL_ENCODER.encode(decision_data).encode()
+        return self._sign_raw(json_bytes).hex()
     
     def verify_signature(self, decision_data: Dict[str, Any], signature: str) -> bool:
         """Verify that the signature matches the decision data"""
         expected_signature = self.sign_decision(decision_data)
         return hmac.compare_digest(expected_signature, signature)
     
-    def create_signed_decision_object(self, result: EnforcementResult) -> Dict[str, Any]:
-        """Create a signed decision object with cryptographic proof"""
-        decision_obj = {
+    def sign_decisions_batch(self, results: List[EnforcementResult]) -> List[str]:
+        """Sign many decisions, returning signatures in input order.
+        
+        Payloads are serialized up front and signed in one loop over the shared
+        encoder and HMAC template. Decision payloads are a few hundred bytes,
+        below the size at which hashlib releases the GIL, so a thread pool
+        would only add overhead.
+        """
+        payloads = [
+            _CANONICAL_ENCODER.encode(self._decision_payload(result)).encode()
+            for result in results
+        ]
+        return [self._sign_raw(payload).hex() for payload in payloads]
+    
+    def _decision_payload(self, result: EnforcementResult) -> Dict[str, Any]:
+        """Fields of a result covered by its signature"""
+        return {
             'decision': result.decision.value,
             'rule_id': result.rule_id,
             'policy_source': result.policy_source.value,
             'reasoning_summary': result.reasoning_summary,
             'trace_id': result.trace_id,
-            'timestamp': result.timestamp.isoformat(),
+            'timestamp': result.timestamp_iso,
             'metadata': result.metadata or {}
         }
+    
+    def create_signed_decision_object(self, result: EnforcementResult) -> Dict[str, Any]:
+        """Create a signed decision object with cryptographic proof"""
+        decision_obj = self._decision_payload(result)
         
         # Add signature
         signature = self.sign_decision(decision_obj)
@@ -4,44 +4,199 @@ Append-only, hash-chained ledger for all enforcement decisions
 """
 import json
 import hashlib
+import operator
 import os
 import threading
+from itertools import islice
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from enforcement_engine.decision_model import EnforcementResult
 
+# Pristine SHA-256 state, copied per entry instead of constructing a new hash
+# object through the hashlib name lookup. hashlib is backed by OpenSSL, which
+# already dispatches to the CPU's SHA extensions where available.
+_SHA256 = hashlib.sha256()
+
+# Shared encoder; json.dumps builds a fresh encoder on every call when given
+# non-default options. Output matches json.dumps(..., sort_keys=True,
+# default=str), so existing hashes stay valid.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+# Appends between fsyncs of the ledger file; sync() forces one at any time
+FSYNC_INTERVAL = 64
+
+_fdatasync = getattr(os, 'fdatasync', os.fsync)
+
+
+def _canonical_bytes(entry: Dict[str, Any]) -> bytes:
+    """Canonical JSON bytes of an entry, as covered by its hash"""
+    return _CANONICAL_ENCODER.encode(entry).encode()
+
+
+# JSONL records end with the entry hash, after the canonical JSON of everything
+# else; the bytes before this suffix (plus the closing brace) are exactly what
+# the hash covers, so a file can be verified without re-serializing entries
+_HASH_FIELD = b', "hash": "'
+_HASH_SUFFIX_LEN = len(_HASH_FIELD) + 64 + len(b'"}')
+
+
+def _hashed_line(canonical: bytes, entry_hash: str) -> bytes:
+    """JSONL record from an entry's canonical bytes and its hash"""
+    return b'%s, "hash": %s}\n' % (canonical[:-1], _CANONICAL_ENCODER.encode(entry_hash).encode())
+
+
+def _read_ledger_file(path: str) -> Tuple[List[Dict[str, Any]], bool]:
+    """Read ledger entries from a JSONL or legacy JSON array file.
+    
+    Returns the entries and whether the file needs rewriting as clean JSONL
+    (legacy format, or a partially written last line that was dropped).
+    """
+    with open(path, 'r') as f:
+        content = f.read()
+    if content.lstrip().startswith('['):
+        return json.loads(content), True
+    entries = []
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            # Partially written line; keep what precedes it
+            return entries, True
+    return entries, False
+
+
+def load_ledger_entries(path: str) -> List[Dict[str, Any]]:
+    """Read all entries from a ledger file in either on-disk format"""
+    return _read_ledger_file(path)[0]
+
 
 class EnforcementLedger:
-    """Immutable ledger for enforcement decisions"""
+    """Immutable ledger for enforcement decisions.
+    
+    Stored as JSON Lines: each append writes one line to the end of the file
+    before returning, instead of rewriting the whole ledger. The file is
+    fsynced every FSYNC_INTERVAL appends; call sync() to force it. Files in
+    the older single JSON array format are still read and are converted on
+    the next append.
+    """
     
     def __init__(self, ledger_path: str = "enforcement_ledger.json"):
         self.ledger_path = ledger_path
         self.lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._unsynced = 0
         self._load_ledger()
     
     def _load_ledger(self):
         """Load the ledger from persistent storage"""
+        self.entries = []
+        # Set when the file on disk no longer matches the JSONL layout of
+        # self.entries (legacy format, torn last line, truncated chain)
+        self._needs_rewrite = False
         if os.path.exists(self.ledger_path):
             try:
-                with open(self.ledger_path, 'r') as f:
-                    self.entries = json.load(f)
+                self.entries, self._needs_rewrite = _read_ledger_file(self.ledger_path)
             except (json.JSONDecodeError, IOError):
                 self.entries = []
-        else:
-            self.entries = []
         
         # Validate ledger integrity
+        entry_count = len(self.entries)
         self._validate_chain()
+        if len(self.entries) != entry_count:
+            self._needs_rewrite = True
+        
+        self._trace_index: Dict[str, List[int]] = {}
+        for i, entry in enumerate(self.entries):
+            self._trace_index.setdefault(entry.get('trace_id'), []).append(i)
+    
+    def _record_entry(self, entry: Dict[str, Any]):
+        """Add an entry to the in-memory ledger and the trace index"""
+        self._trace_index.setdefault(entry.get('trace_id'), []).append(len(self.entries))
+        self.entries.append(entry)
     
     def _save_ledger(self):
-        """Save the ledger to persistent storage"""
+        """Rewrite the whole ledger file from memory"""
         try:
-            with open(self.ledger_path, 'w') as f:
-                json.dump(self.entries, f, indent=2)
+            # Serialize before opening so an unserializable entry cannot
+            # leave a half-written file behind
+            data = b''.join(self._encode_line(entry) for entry in self.entries)
+            self._close_file()
+            with open(self.ledger_path, 'wb') as f:
+                f.write(data)
+            self._needs_rewrite = False
         except IOError:
             # Fail silently to prevent disrupting operations
             pass
     
+    @staticmethod
+    def _encode_line(entry: Dict[str, Any]) -> bytes:
+        """One JSONL record for an entry, with its hash as the last field"""
+        if 'hash' not in entry:
+            return _canonical_bytes(entry) + b'\n'
+        body = entry.copy()
+        entry_hash = body.pop('hash')
+        return _hashed_line(_canonical_bytes(body), entry_hash)
+    
+    def _persist_entry(self, entry: Dict[str, Any], line: Optional[bytes] = None):
+        """Append a single entry (or its pre-encoded line) to the ledger file"""
+        if self._needs_rewrite:
+            self._save_ledger()
+            return
+        try:
+            if self._fd is None:
+                self._fd = os.open(self.ledger_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            data = memoryview(line if line is not None else self._encode_line(entry))
+            while data:
+                data = data[os.write(self._fd, data):]
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_INTERVAL:
+                self._sync_file()
+        except OSError:
+            # Fail silently to prevent disrupting operations. The file may
+            # now lack this entry or end in a torn record, so the next
+            # append rewrites it from memory instead of chaining onto it.
+            self._needs_rewrite = True
+            try:
+                self._close_file()
+            except OSError:
+                self._fd = None
+    
+    def _sync_file(self):
+        if self._fd is not None:
+            _fdatasync(self._fd)
+        self._unsynced = 0
+    
+    def _close_file(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._unsynced = 0
+    
+    def sync(self):
+        """Force appended entries to stable storage"""
+        with self.lock:
+            try:
+                self._sync_file()
+            except OSError:
+                pass
+    
+    def close(self):
+        """Sync and close the ledger file; a later append reopens it"""
+        with self.lock:
+            try:
+                self._sync_file()
+            except OSError:
+                pass
+            self._close_file()
+    
+    def __del__(self):
+        try:
+            self._close_file()
+        except Exception:
+            pass
+    
     def _validate_chain(self):
         """Validate the hash chain integrity"""
         for i in range(1, len(self.entries)):
@@ -58,180 +213,130 @@ class EnforcementLedger:
     
     def _calculate_hash(self, entry: Dict[str, Any]) -> str:
         """Calculate hash for an entry"""
-        # Remove existing hash to avoid circular dependency
-        entry_copy = entry.copy()
-        entry_copy.pop('hash', None)
+        if 'hash' in entry:
+            # Remove existing hash to avoid circular dependency
+            entry = entry.copy()
+            del entry['hash']
         
-        json_str = json.dumps(entry_copy, sort_keys=True, default=str)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        return self._canon_and_hash(entry)[1]
     
-    def append_enforcement_decision(self, result: EnforcementResult, additional_data: Optional[Dict[str, Any]] = None) -> str:
-        """Append an enforcement decision to the ledger"""
+    @staticmethod
+    def _canon_and_hash(entry: Dict[str, Any]) -> Tuple[bytes, str]:
+        """Canonical bytes of an entry without a 'hash' key, and their hash.
+        
+        The bytes can be reused for the JSONL record or handed to
+        EnforcementProvenanceSigner.sign_bytes without serializing again.
+        """
+        canonical = _canonical_bytes(entry)
+        digest = _SHA256.copy()
+        digest.update(canonical)
+        return canonical, digest.hexdigest()
+    
+    def _append(self, entry_type: str, fields: Dict[str, Any]) -> str:
+        """Chain, hash, record and persist a new entry; returns its hash"""
         with self.lock:
             # Create ledger entry
             entry = {
-                'type': 'enforcement_decision',
+                'type': entry_type,
                 'timestamp': datetime.utcnow().isoformat(),
-                'decision': result.decision.value,
-                'rule_id': result.rule_id,
-                'policy_source': result.policy_source.value,
-                'reasoning_summary': result.reasoning_summary,
-                'trace_id': result.trace_id,
-                'proof_hash': result.proof_hash,
-                'signed_decision_object': result.signed_decision_object,
-                'additional_data': additional_data or {}
+                **fields
             }
             
             # Add previous hash if ledger is not empty
-            if self.entries:
-                entry['prev_hash'] = self.entries[-1]['hash']
-            else:
-                entry['prev_hash'] = 'GENESIS'
+            entry['prev_hash'] = self.entries[-1]['hash'] if self.entries else 'GENESIS'
             
-            # Calculate hash for this entry
-            entry['hash'] = self._calculate_hash(entry)
+            # Calculate hash for this entry; it has no 'hash' key yet
+            canonical, entry['hash'] = self._canon_and_hash(entry)
             
             # Append to ledger
-            self.entries.append(entry)
+            self._record_entry(entry)
             
-            # Save to persistent storage
-            self._save_ledger()
+            # Save to persistent storage, reusing the bytes just hashed
+            self._persist_entry(entry, _hashed_line(canonical, entry['hash']))
             
             return entry['hash']
     
+    def append_enforcement_decision(self, result: EnforcementResult, additional_data: Optional[Dict[str, Any]] = None) -> str:
+        """Append an enforcement decision to the ledger"""
+        return self._append('enforcement_decision', {
+            'decision': result.decision.value,
+            'rule_id': result.rule_id,
+            'policy_source': result.policy_source.value,
+            'reasoning_summary': result.reasoning_summary,
+            'trace_id': result.trace_id,
+            'proof_hash': result.proof_hash,
+            'signed_decision_object': result.signed_decision_object,
+            'additional_data': additional_data or {}
+        })
+    
     def append_agent_execution(self, trace_id: str, execution_details: Dict[str, Any]) -> str:
         """Append an agent execution to the ledger"""
-        with self.lock:
-            entry = {
-                'type': 'agent_execution',
-                'timestamp': datetime.utcnow().isoformat(),
-                'trace_id': trace_id,
-                'execution_details': execution_details
-            }
-            
-            # Add previous hash if ledger is not empty
-            if self.entries:
-                entry['prev_hash'] = self.entries[-1]['hash']
-            else:
-                entry['prev_hash'] = 'GENESIS'
-            
-            # Calculate hash for this entry
-            entry['hash'] = self._calculate_hash(entry)
-            
-            # Append to ledger
-            self.entries.append(entry)
-            
-            # Save to persistent storage
-            self._save_ledger()
-            
-            return entry['hash']
+        return self._append('agent_execution', {'trace_id': trace_id, 'execution_details': execution_details})
     
     def append_routing_decision(self, trace_id: str, routing_details: Dict[str, Any]) -> str:
         """Append a routing decision to the ledger"""
-        with self.lock:
-            entry = {
-                'type': 'routing_decision',
-                'timestamp': datetime.utcnow().isoformat(),
-                'trace_id': trace_id,
-                'routing_details': routing_details
-            }
-            
-            # Add previous hash if ledger is not empty
-            if self.entries:
-                entry['prev_hash'] = self.entries[-1]['hash']
-            else:
-                entry['prev_hash'] = 'GENESIS'
-            
-            # Calculate hash for this entry
-            entry['hash'] = self._calculate_hash(entry)
-            
-            # Append to ledger
-            self.entries.append(entry)
-            
-            # Save to persistent storage
-            self._save_ledger()
-            
-            return entry['hash']
+        return self._append('routing_decision', {'trace_id': trace_id, 'routing_details': routing_details})
     
     def append_rl_update(self, trace_id: str, rl_details: Dict[str, Any]) -> str:
         """Append an RL update to the ledger"""
-        with self.lock:
-            entry = {
-                'type': 'rl_update',
-                'timestamp': datetime.utcnow().isoformat(),
-                'trace_id': trace_id,
-                'rl_details': rl_details
-            }
-            
-            # Add previous hash if ledger is not empty
-            if self.entries:
-                entry['prev_hash'] = self.entries[-1]['hash']
-            else:
-                entry['prev_hash'] = 'GENESIS'
-            
-            # Calculate hash for this entry
-            entry['hash'] = self._calculate_hash(entry)
-            
-            # Append to ledger
-            self.entries.append(entry)
-            
-            # Save to persistent storage
-            self._save_ledger()
-            
-            return entry['hash']
+        return self._append('rl_update', {'trace_id': trace_id, 'rl_details': rl_details})
     
     def append_refusal_or_escalation(self, trace_id: str, refusal_details: Dict[str, Any]) -> str:
         """Append a refusal or escalation to the ledger"""
-        with self.lock:
-            entry = {
-                'type': 'refusal_or_escalation',
-                'timestamp': datetime.utcnow().isoformat(),
-                'trace_id': trace_id,
-                'refusal_details': refusal_details
-            }
-            
-            # Add previous hash if ledger is not empty
-            if self.entries:
-                entry['prev_hash'] = self.entries[-1]['hash']
-            else:
-                entry['prev_hash'] = 'GENESIS'
-            
-            # Calculate hash for this entry
-            entry['hash'] = self._calculate_hash(entry)
-            
-            # Append to ledger
-            self.entries.append(entry)
-            
-            # Save to persistent storage
-            self._save_ledger()
-            
-            return entry['hash']
+        return self._append('refusal_or_escalation', {'trace_id': trace_id, 'refusal_details': refusal_details})
     
     def get_trace_chain(self, trace_id: str) -> List[Dict[str, Any]]:
         """Get the complete chain of events for a trace"""
-        trace_entries = []
-        for entry in self.entries:
-            if entry.get('trace_id') == trace_id:
-                trace_entries.append(entry)
-        return trace_entries
+        return [self.entries[i] for i in self._trace_index.get(trace_id, ())]
     
     def verify_integrity(self) -> bool:
         """Verify the integrity of the entire ledger"""
         try:
-            for i in range(1, len(self.entries)):
-                prev_entry = self.entries[i-1]
-                curr_entry = self.entries[i]
-                
-                # Check hash chain
-                expected_prev_hash = prev_entry.get('hash')
-                actual_prev_hash = curr_entry.get('prev_hash')
-                
-                if expected_prev_hash != actual_prev_hash:
+            entries = self.entries
+            
+            # Check the whole hash chain first; comparing stored digests is
+            # cheap next to re-serializing entries, so a break fails fast
+            hashes = [entry.get('hash') for entry in entries]
+            prev_hashes = [entry.get('prev_hash') for entry in entries]
+            if not all(map(operator.eq, hashes, islice(prev_hashes, 1, None))):
+                return False
+            
+            # Recalculate each hash to verify entries haven't been tampered with
+            calculate_hash = self._calculate_hash
+            return all(calculate_hash(entry) == entry['hash'] for entry in islice(entries, 1, None))
+        except Exception:
+            return False
+    
+    def verify_file_integrity(self) -> bool:
+        """Verify the hash chain and every entry hash of the ledger file on disk.
+        
+        Records written by this class are checked by hashing their raw bytes;
+        only records in another layout (e.g. legacy files) are re-serialized.
+        """
+        try:
+            with open(self.ledger_path, 'rb') as f:
+                content = f.read()
+            if content.lstrip().startswith(b'['):
+                records = [(None, entry) for entry in json.loads(content)]
+            else:
+                records = [(line, json.loads(line)) for line in content.splitlines() if line.strip()]
+            
+            prev_hash = None
+            for i, (line, entry) in enumerate(records):
+                if i > 0 and entry.get('prev_hash') != prev_hash:
                     return False
+                prev_hash = entry.get('hash')
                 
-                # Recalculate current hash to verify it hasn't been tampered with
-                calculated_hash = self._calculate_hash(curr_entry)
-                if calculated_hash != curr_entry['hash']:
+                if (line is not None and isinstance(prev_hash, str)
+                        and line.endswith(b'"}')
+                        and line[-_HASH_SUFFIX_LEN:-66] == _HASH_FIELD
+                        and line[-66:-2] == prev_hash.encode()):
+                    digest = _SHA256.copy()
+                    digest.update(line[:-_HASH_SUFFIX_LEN] + b'}')
+                    calculated_hash = digest.hexdigest()
+                else:
+                    calculated_hash = self._calculate_hash(entry)
+                if calculated_hash != prev_hash:
                     return False
             
             return True
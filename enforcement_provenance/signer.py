@@ -9,6 +9,10 @@ import json
 from typing import Dict, Any
 from datetime import datetime
 
+# Shared canonical encoder; identical output to
+# json.dumps(data, sort_keys=True, default=str) without rebuilding an encoder
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
 
 class EnforcementProvenanceSigner:
     """Handles cryptographic signing of enforcement provenance events"""
@@ -17,16 +21,18 @@ class EnforcementProvenanceSigner:
         if secret_key is None:
             secret_key = os.getenv('HMAC_SECRET_KEY', 'default_enforcement_key')
         self.secret_key = secret_key.encode() if isinstance(secret_key, str) else secret_key
+        # Keyed HMAC state; copied per signature so the key pads are derived once
+        self._hmac_template = hmac.new(self.secret_key, b'', hashlib.sha256)
     
     def sign_event(self, event_data: Dict[str, Any]) -> str:
         """Sign event data using HMAC-SHA256"""
-        json_str = json.dumps(event_data, sort_keys=True, default=str)
-        signature = hmac.new(
-            self.secret_key,
-            json_str.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        return self.sign_bytes(_CANONICAL_ENCODER.encode(event_data).encode())
+    
+    def sign_bytes(self, data: bytes) -> str:
+        """Sign already-canonical JSON bytes using HMAC-SHA256"""
+        signature = self._hmac_template.copy()
+        signature.update(data)
+        return signature.hexdigest()
     
     def verify_signature(self, event_data: Dict[str, Any], signature: str) -> bool:
         """Verify that the signature matches the event data"""
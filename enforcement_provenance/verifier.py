@@ -4,11 +4,21 @@ Verifies authenticity and integrity of enforcement events
 """
 import hmac
 import hashlib
+import operator
 import os
 import json
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, Any, List, Tuple
 from datetime import datetime
 
+# Shared canonical encoder; identical output to
+# json.dumps(data, sort_keys=True, default=str) without rebuilding an encoder
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+# Number of (payload, signature) pairs whose verification result is memoized
+VERIFY_CACHE_SIZE = 4096
+
 
 class EnforcementProvenanceVerifier:
     """Verifies authenticity and integrity of enforcement provenance events"""
@@ -17,14 +27,36 @@ class EnforcementProvenanceVerifier:
         if secret_key is None:
             secret_key = os.getenv('HMAC_SECRET_KEY', 'default_enforcement_key')
         self.secret_key = secret_key.encode() if isinstance(secret_key, str) else secret_key
+        # Keyed HMAC state; copied per signature so the key pads are derived once
+        self._hmac_template = hmac.new(self.secret_key, b'', hashlib.sha256)
+        # Memo of verification results keyed by the exact signed bytes and
+        # signature, so re-verifying an unchanged event skips the HMAC. Keying
+        # on content (not on a stored 'hash' field) keeps edited events from
+        # hitting a stale entry; the cache is per verifier and thus per key.
+        self._verify_payload = lru_cache(maxsize=VERIFY_CACHE_SIZE)(self._verify_payload_uncached)
+    
+    def clear_cache(self) -> None:
+        """Drop memoized verification results"""
+        self._verify_payload.cache_clear()
     
     def verify_signature(self, event_data: Dict[str, Any], signature: str) -> bool:
         """Verify the signature of an event"""
-        expected_signature = self._calculate_signature(event_data)
-        return hmac.compare_digest(expected_signature, signature)
+        return self._verify_payload(self._signed_payload(event_data), signature)
+    
+    def _verify_payload_uncached(self, payload: bytes, signature: str) -> bool:
+        return hmac.compare_digest(self._sign_payload(payload), signature)
     
     def _calculate_signature(self, event_data: Dict[str, Any]) -> str:
         """Calculate signature for event data"""
+        return self._sign_payload(self._signed_payload(event_data))
+    
+    def _sign_payload(self, payload: bytes) -> str:
+        signature = self._hmac_template.copy()
+        signature.update(payload)
+        return signature.hexdigest()
+    
+    def _signed_payload(self, event_data: Dict[str, Any]) -> bytes:
+        """Canonical bytes covered by an event's signature"""
         # We need to exclude the signature itself from the calculation
         data_to_verify = event_data.copy()
         if 'signature' in data_to_verify:
@@ -34,13 +66,7 @@ class EnforcementProvenanceVerifier:
         if 'algorithm' in data_to_verify:
             del data_to_verify['algorithm']
         
-        json_str = json.dumps(data_to_verify, sort_keys=True, default=str)
-        signature = hmac.new(
-            self.secret_key,
-            json_str.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
+        return _CANONICAL_ENCODER.encode(data_to_verify).encode()
     
     def verify_signed_event(self, signed_event: Dict[str, Any]) -> Tuple[bool, str]:
         """Verify a complete signed event"""
@@ -71,6 +97,10 @@ class EnforcementProvenanceVerifier:
             if not is_valid:
                 return False, f"Event {i} invalid: {message}"
         
+        return self._verify_hash_links(event_chain)
+    
+    def _verify_hash_links(self, event_chain: List[Dict[str, Any]]) -> Tuple[bool, str]:
+        """Check prev_hash links between consecutive events"""
         # Verify hash chain if prev_hash is available
         for i in range(1, len(event_chain)):
             prev_event = event_chain[i-1]
@@ -106,22 +136,23 @@ class EnforcementProvenanceVerifier:
                     'error': message
                 })
         
-        # Verify chain integrity
-        chain_valid, chain_msg = self.verify_event_chain(trace_events)
+        # Verify chain integrity; signatures were checked above, so only the
+        # hash links remain (verify_event_chain would recompute every HMAC)
+        if verification_results['invalid_events']:
+            chain_valid = False
+        else:
+            chain_valid, chain_msg = self._verify_hash_links(trace_events)
         verification_results['chain_integrity'] = chain_valid
         
         if not chain_valid:
             verification_results['overall_validity'] = False
         
         # Verify timestamps are in order (optional check)
-        timestamps = []
-        for event in trace_events:
-            if 'timestamp' in event:
-                timestamps.append(event['timestamp'])
+        timestamps = [event['timestamp'] for event in trace_events if 'timestamp' in event]
         
-        # Check if timestamps are roughly in chronological order
-        sorted_timestamps = sorted(timestamps)
-        if timestamps != sorted_timestamps:
+        # Check if timestamps are roughly in chronological order; ISO-8601
+        # strings compare chronologically, so one pass over neighbours suffices
+        if not all(map(operator.le, timestamps, islice(timestamps, 1, None))):
             verification_results['timestamp_validity'] = False
             verification_results['overall_validity'] = False
         
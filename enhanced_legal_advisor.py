@@ -1,9 +1,16 @@
 import json
 import hashlib
+import heapq
+import inspect
+import pickle
+import tempfile
+from collections import defaultdict
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 
 # Import existing components
 import sys
@@ -15,6 +22,109 @@ from data_bridge.schemas.section import Section, Jurisdiction
 from events.event_types import EventType
 from procedures.loader import procedure_loader
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Distinct (query, jurisdiction, domain) searches remembered per advisor
+SEARCH_CACHE_SIZE = 4096
+
+# Version of the pickled index layout; bump it when the layout changes
+INDEX_CACHE_VERSION = 1
+
+# Keywords that point a query at a jurisdiction
+JURISDICTION_KEYWORDS = {
+    'IN': ('india', 'indian', 'ipc', 'crpc', 'bns', 'bharatiya', 'nyaya', 'sanhita',
+           'delhi', 'mumbai', 'bangalore', 'chennai', 'kolkata', 'hyderabad',
+           'supreme court of india', 'high court', 'magistrate', 'fir', 'police station'),
+    'UK': ('uk', 'britain', 'england', 'scotland', 'wales', 'london', 'manchester',
+           'crown court', 'magistrates court', 'british', 'english law', 'cps',
+           'crown prosecution service', 'solicitor', 'barrister'),
+    'UAE': ('uae', 'emirates', 'dubai', 'abu dhabi', 'sharjah', 'ajman', 'ras al khaimah',
+            'fujairah', 'umm al quwain', 'federal law', 'sharia', 'dirhams', 'aed'),
+}
+
+# Keywords that point a query at a legal domain, in tie-break order
+DOMAIN_KEYWORDS = {
+    'criminal': ('theft', 'murder', 'assault', 'rape', 'robbery', 'burglary', 'fraud',
+                 'kidnapping', 'extortion', 'criminal', 'crime', 'police', 'arrest',
+                 'fir', 'charge', 'prosecution', 'jail', 'prison', 'bail', 'custody',
+                 'investigation', 'evidence', 'witness', 'accused', 'defendant',
+                 'cybercrime', 'drugs', 'trafficking', 'terrorism', 'violence', 'suicide'),
+    'civil': ('contract', 'property', 'tort', 'damages', 'compensation', 'negligence',
+              'breach', 'liability', 'dispute', 'claim', 'suit', 'plaintiff',
+              'defendant', 'injunction', 'specific performance', 'restitution',
+              'employment', 'landlord', 'tenant', 'consumer', 'insurance'),
+    'family': ('marriage', 'divorce', 'custody', 'family', 'child', 'adoption',
+               'maintenance', 'alimony', 'dowry', 'domestic violence', 'separation',
+               'matrimonial', 'guardianship', 'inheritance', 'succession', 'will'),
+    'commercial': ('company', 'business', 'commercial', 'corporate', 'partnership',
+                   'llc', 'limited liability', 'shares', 'shareholders', 'directors',
+                   'merger', 'acquisition', 'bankruptcy', 'insolvency', 'trade',
+                   'intellectual property', 'patent', 'trademark', 'copyright'),
+}
+
+# Words in a section's text that mark it as relevant to a domain; each one
+# found adds 3 to the section's keyword score
+DOMAIN_RELEVANCE_KEYWORDS = {
+    'criminal': ('offence', 'punishment', 'imprisonment', 'fine', 'criminal'),
+    'civil': ('damages', 'compensation', 'liability', 'breach', 'contract'),
+    'family': ('marriage', 'divorce', 'custody', 'family', 'matrimonial'),
+    'commercial': ('company', 'business', 'commercial', 'trade', 'corporate'),
+}
+
+# Shared encoder for ledger event hashes; json.dumps would build a new encoder
+# per call because of sort_keys. Output matches json.dumps(event, sort_keys=True),
+# so existing ledger hashes stay reproducible.
+_LEDGER_ENCODER = json.JSONEncoder(sort_keys=True)
+
+# Jurisdiction members by code, for identity comparisons on Section.jurisdiction
+JURISDICTION_BY_VALUE = {j.value: j for j in Jurisdiction}
+
+# Words in a section's text that mark the matter as a serious crime
+SERIOUS_CRIME_KEYWORDS = ('murder', 'homicide', 'terrorism', 'trafficking')
+
+class KeywordCounter:
+    """Counts, per category, how many of its keywords occur in a text.
+    
+    Keywords match as substrings, so phrases and partial words count the
+    same as a plain `keyword in text` check. With pyahocorasick installed
+    the text is scanned once for all keywords; otherwise each keyword is
+    checked in turn.
+    """
+    
+    def __init__(self, categories: Dict[str, tuple]):
+        self.categories = categories
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE:
+            owners = {}
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    owners.setdefault(keyword, []).append(category)
+            if owners:
+                automaton = ahocorasick.Automaton()
+                for keyword, keyword_owners in owners.items():
+                    automaton.add_word(keyword, (keyword, keyword_owners))
+                automaton.make_automaton()
+                self._automaton = automaton
+    
+    def count(self, text: str) -> Dict[str, int]:
+        """Number of keywords found in text for each category, in category order"""
+        if self._automaton is None:
+            return {
+                category: sum(1 for keyword in keywords if keyword in text)
+                for category, keywords in self.categories.items()
+            }
+        counts = dict.fromkeys(self.categories, 0)
+        # Each distinct keyword found counts once for every category listing it
+        found = {keyword: owners for _, (keyword, owners) in self._automaton.iter(text)}
+        for owners in found.values():
+            for category in owners:
+                counts[category] += 1
+        return counts
+
 class LegalDomain(Enum):
     CRIMINAL = "criminal"
     CIVIL = "civil"
@@ -42,52 +152,273 @@ class LegalAdvice:
     trace_id: str
     timestamp: str
 
+# Remedies returned per piece of advice
+MAX_REMEDIES = 8
+
+# Remedy lists by jurisdiction; the None entry applies to any other jurisdiction
+SEXUAL_OFFENCE_REMEDIES = {
+    'IN': (
+        "🔒 Criminal prosecution with rigorous imprisonment (minimum 7 years, may extend to life)",
+        "💰 Compensation under Section 357A CrPC (up to ₹10 lakhs)",
+        "⚖️  Free legal aid under Legal Services Authorities Act",
+        "🛡️  Protection under Witness Protection Scheme",
+        "🏥 Medical treatment at government expense",
+        "🏠 Shelter and rehabilitation services",
+        "📞 24/7 helpline support (1091 Women Helpline)"
+    ),
+    'UK': (
+        "🔒 Criminal prosecution with life imprisonment possible",
+        "💰 Criminal Injuries Compensation Authority (CICA) claim",
+        "⚖️  Special measures for vulnerable witnesses",
+        "🛡️  Restraining orders and protection",
+        "🏥 NHS counseling and medical support"
+    ),
+    'UAE': (
+        "🔒 Criminal prosecution with severe penalties",
+        "💰 Diya (blood money) compensation",
+        "⚖️  Court-ordered compensation",
+        "🛡️  Protection orders",
+        "🏥 Medical and psychological support"
+    ),
+}
+
+SERIOUS_CRIME_REMEDIES = {
+    'IN': (
+        "🔒 Criminal prosecution with life imprisonment/death penalty",
+        "💰 Victim compensation under CrPC",
+        "⚖️  Free legal aid",
+        "🛡️  Witness protection",
+        "📈 Appeal to higher courts"
+    ),
+    None: (
+        "🔒 Criminal prosecution with maximum penalties",
+        "💰 Victim compensation schemes",
+        "⚖️  Legal aid and support",
+        "🛡️  Protection measures"
+    ),
+}
+
+# Fallback remedies by domain when sections carry none in their metadata
+DOMAIN_REMEDIES = {
+    'criminal': {
+        'IN': (
+            "🔒 Criminal prosecution and imprisonment/fine as per law",
+            "💰 Compensation under Section 357A CrPC",
+            "⚖️  Legal aid if eligible"
+        ),
+        'UK': (
+            "🔒 Criminal prosecution and sentencing",
+            "💰 Criminal Injuries Compensation",
+            "⚖️  Legal aid if eligible"
+        ),
+        'UAE': (
+            "🔒 Criminal prosecution and penalties",
+            "💰 Court-ordered compensation",
+            "⚖️  Legal representation"
+        ),
+    },
+    'civil': {
+        None: (
+            "💰 Monetary damages and compensation",
+            "⚖️  Specific performance of contract",
+            "🚫 Injunctive relief",
+            "🔄 Restitution and restoration"
+        ),
+    },
+    'family': {
+        'IN': (
+            "👨👩👧👦 Child custody and visitation rights",
+            "💰 Maintenance and alimony",
+            "🏠 Property settlement",
+            "🛡️  Protection orders if needed"
+        ),
+        None: (
+            "👨👩👧👦 Child arrangements orders",
+            "💰 Financial settlements",
+            "🏠 Property division",
+            "🛡️  Non-molestation orders"
+        ),
+    },
+    'commercial': {
+        None: (
+            "💰 Breach of contract damages",
+            "⚖️  Specific performance",
+            "🚫 Injunctive relief",
+            "🔄 Rescission and restitution",
+            "📊 Account of profits"
+        ),
+    },
+}
+
+def _metadata_remedies(section: Section) -> tuple:
+    """Remedies listed in a section's metadata, formatted for display"""
+    remedies = []
+    if section.metadata:
+        if 'civil_remedies' in section.metadata:
+            section_remedies = section.metadata['civil_remedies']
+            if isinstance(section_remedies, list):
+                remedies.extend([f"⚖️  {remedy}" for remedy in section_remedies])
+            else:
+                remedies.append(f"⚖️  {section_remedies}")
+        
+        if 'punishment' in section.metadata:
+            remedies.append(f"🔒 Criminal: {section.metadata['punishment']}")
+    return tuple(remedies)
+
+def _jurisdiction_remedies(table: Dict[Optional[str], tuple], jurisdiction: str) -> List[str]:
+    """Remedies for jurisdiction from a remedy table, falling back to its None entry"""
+    return list(table.get(jurisdiction, table.get(None, ())))
+
 class EnhancedLegalAdvisor:
-    def __init__(self):
+    # Loaded data and indexes saved to and restored from the index cache
+    _INDEX_CACHE_ATTRS = (
+        'sections', 'acts', 'cases', 'section_index', 'jurisdiction_sections',
+        'jurisdiction_section_index', 'sections_by_number', 'crime_sections', 'metadata_texts'
+    )
+    
+    def __init__(self, index_cache_dir: Optional[str] = None):
+        """index_cache_dir opts in to pickling the built indexes there.
+        
+        Loading a pickle runs code from the file, so only pass a directory
+        that no one else can write to.
+        """
         self.loader = JSONLoader("db")
-        self.sections, self.acts, self.cases = self.loader.load_and_normalize_directory()
         self.enforcement_ledger = []
-        
-        # Create comprehensive searchable indexes
-        self.section_index = self._build_section_index()
-        self.jurisdiction_sections = self._build_jurisdiction_index()
         self.crime_mappings = self._build_crime_mappings()
         
+        # Create comprehensive searchable indexes, reusing the pickled copy
+        # when neither the database nor the indexing code has changed
+        self.index_cache_dir = index_cache_dir
+        cache_path = self._index_cache_path() if index_cache_dir else None
+        if cache_path is None or not self._load_index_cache(cache_path):
+            self.sections, self.acts, self.cases = self.loader.load_and_normalize_directory()
+            self.section_index = self._build_section_index()
+            self.jurisdiction_sections = self._build_jurisdiction_index()
+            self.jurisdiction_section_index = self._build_jurisdiction_section_index()
+            self.sections_by_number = self._build_section_number_index()
+            self.crime_sections = self._build_crime_sections()
+            self.metadata_texts = self._build_metadata_index()
+            if cache_path is not None:
+                self._save_index_cache(cache_path)
+        # Keyed by id(section), so always rebuilt for this process's objects
+        self.domain_bonuses = self._build_domain_bonuses()
+        self.metadata_remedies = self._build_metadata_remedies()
+        self.serious_crime_flags = self._build_serious_crime_flags()
+        
+        # Keyword matchers built once instead of rescanning keyword lists per query
+        self._jurisdiction_matcher = KeywordCounter(JURISDICTION_KEYWORDS)
+        self._domain_matcher = KeywordCounter(DOMAIN_KEYWORDS)
+        self._crime_matchers = {
+            jurisdiction: KeywordCounter({
+                crime: tuple(dict.fromkeys([crime] + crime.split('_')))
+                for crime in crimes
+            })
+            for jurisdiction, crimes in self.crime_mappings.items()
+        }
+        
+        # Created on first use; it loads the ontology and the database itself
+        self._statute_resolver = None
+        
+        # Memo of search results keyed by the exact query, jurisdiction and
+        # domain. The statute resolver sees the raw query, so it is not
+        # normalized. Resolver failures raise and are therefore not cached.
+        self._cached_advisor_sections = lru_cache(maxsize=SEARCH_CACHE_SIZE)(self._advisor_sections)
+        self._cached_statute_sections = lru_cache(maxsize=SEARCH_CACHE_SIZE)(self._statute_sections)
+        
         print(f"Enhanced Legal Advisor loaded:")
         print(f"  - {len(self.sections)} sections")
         print(f"  - {len(self.acts)} acts") 
         print(f"  - {len(self.cases)} cases")
         print(f"  - {len(self.jurisdiction_sections)} jurisdictions")
         
+    def _index_cache_path(self) -> Optional[str]:
+        """Index cache file for the current database files and indexing code.
+        
+        The fingerprint covers this module (the index builders, keyword tables
+        and KeywordCounter), every module of the data_bridge package that
+        loads and normalizes the database, and the database files. Returns
+        None if any of them cannot be read, so the indexes are built fresh.
+        """
+        fingerprint = hashlib.sha256(str(INDEX_CACHE_VERSION).encode())
+        try:
+            sources = [__file__]
+            package_dir = os.path.dirname(inspect.getfile(JSONLoader))
+            for root, dirs, files in os.walk(package_dir):
+                dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+                sources.extend(os.path.join(root, file) for file in sorted(files) if file.endswith('.py'))
+            # Same walk as load_and_normalize_directory, so a change in load
+            # order also changes the fingerprint
+            for root, dirs, files in os.walk(self.loader.input_directory):
+                for file in files:
+                    if file.lower().endswith('.json'):
+                        sources.append(os.path.join(root, file))
+            for path in sources:
+                stat = os.stat(path)
+                fingerprint.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+        except OSError:
+            return None
+        return os.path.join(self.index_cache_dir, f"legal_index_{fingerprint.hexdigest()[:16]}.pkl")
+    
+    def _load_index_cache(self, cache_path: str) -> bool:
+        """Restore loaded data and indexes from cache_path; False if unusable"""
+        try:
+            with open(cache_path, 'rb') as f:
+                state = pickle.load(f)
+            for attr in self._INDEX_CACHE_ATTRS:
+                setattr(self, attr, state[attr])
+            return True
+        except Exception:
+            # Missing, stale or corrupt cache; the caller rebuilds everything
+            return False
+    
+    def _save_index_cache(self, cache_path: str) -> None:
+        """Pickle loaded data and indexes to cache_path, replacing older caches"""
+        state = {attr: getattr(self, attr) for attr in self._INDEX_CACHE_ATTRS}
+        cache_dir = self.index_cache_dir
+        tmp_path = None
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial cache
+            with tempfile.NamedTemporaryFile('wb', dir=cache_dir, suffix='.tmp', delete=False) as f:
+                tmp_path = f.name
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            tmp_path = None
+            for name in os.listdir(cache_dir):
+                stale_path = os.path.join(cache_dir, name)
+                if name.startswith('legal_index_') and name.endswith('.pkl') and stale_path != cache_path:
+                    os.remove(stale_path)
+        except Exception:
+            # The cache is an optimisation; the advisor works without it
+            pass
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+    
     def _build_section_index(self) -> Dict[str, List[Section]]:
         """Build comprehensive searchable index of sections by keywords"""
-        index = {}
+        index = defaultdict(list)
         for section in self.sections:
-            # Index by section text keywords
-            words = section.text.lower().split()
-            for word in words:
-                if len(word) > 2:  # Include more words
-                    if word not in index:
-                        index[word] = []
-                    index[word].append(section)
+            # Index by section text keywords; each section is posted once per
+            # key however often the word repeats
+            keys = dict.fromkeys(word for word in section.text_lower.split() if len(word) > 2)
             
             # Index by section number
             if section.section_number:
-                key = section.section_number.lower()
-                if key not in index:
-                    index[key] = []
-                index[key].append(section)
+                keys[section.section_number.lower()] = None
                 
             # Index by act_id keywords
             if section.act_id:
                 act_words = section.act_id.lower().replace('_', ' ').split()
-                for word in act_words:
-                    if len(word) > 2:
-                        if word not in index:
-                            index[word] = []
-                        index[word].append(section)
+                keys.update(dict.fromkeys(word for word in act_words if len(word) > 2))
+            
+            for key in keys:
+                index[key].append(section)
         
-        return index
+        return dict(index)
     
     def _build_jurisdiction_index(self) -> Dict[str, List[Section]]:
         """Build index by jurisdiction"""
@@ -99,6 +430,66 @@ class EnhancedLegalAdvisor:
             index[jurisdiction].append(section)
         return index
     
+    def _build_jurisdiction_section_index(self) -> Dict[str, Dict[str, List[Section]]]:
+        """Split the keyword index by jurisdiction so searches skip other jurisdictions"""
+        index = {jurisdiction: defaultdict(list) for jurisdiction in self.jurisdiction_sections}
+        for key, postings in self.section_index.items():
+            for section in postings:
+                index[section.jurisdiction.value][key].append(section)
+        return {jurisdiction: dict(keys) for jurisdiction, keys in index.items()}
+    
+    def _build_metadata_remedies(self) -> Dict[int, tuple]:
+        """Format the remedies listed in each section's metadata once, keyed by id(section)"""
+        return {id(section): _metadata_remedies(section) for section in self.sections}
+    
+    def _build_serious_crime_flags(self) -> Dict[int, bool]:
+        """Whether each section's text mentions a serious crime, keyed by id(section)"""
+        return {
+            id(section): any(word in section.text_lower for word in SERIOUS_CRIME_KEYWORDS)
+            for section in self.sections
+        }
+    
+    def _build_domain_bonuses(self) -> Dict[str, Dict[int, int]]:
+        """Precompute each section's domain relevance boost, keyed by id(section).
+        
+        Section ids are not unique across files, so the loaded Section objects
+        themselves (alive as long as the advisor) identify the entries. Only
+        non-zero boosts are stored.
+        """
+        bonuses = {}
+        for domain, keywords in DOMAIN_RELEVANCE_KEYWORDS.items():
+            bonuses[domain] = {}
+            for section in self.sections:
+                section_text_lower = section.text_lower
+                bonus = sum(3 for domain_word in keywords if domain_word in section_text_lower)
+                if bonus:
+                    bonuses[domain][id(section)] = bonus
+        return bonuses
+    
+    def _build_metadata_index(self) -> Dict[str, List[tuple]]:
+        """Lowercased metadata text of each section that has metadata, by jurisdiction"""
+        index = {}
+        for jurisdiction, sections in self.jurisdiction_sections.items():
+            index[jurisdiction] = [
+                (section, str(section.metadata).lower())
+                for section in sections
+                if section.metadata
+            ]
+        return index
+    
+    def _build_section_number_index(self) -> Dict[tuple, List[tuple]]:
+        """Build index of (jurisdiction, section_number) to (position, section) pairs.
+        
+        Several acts can share a section number, so each key keeps every match
+        along with its position in self.sections.
+        """
+        index = {}
+        for position, section in enumerate(self.sections):
+            if section.section_number:
+                key = (section.jurisdiction.value, section.section_number)
+                index.setdefault(key, []).append((position, section))
+        return index
+    
     def _build_crime_mappings(self) -> Dict[str, Dict[str, List[str]]]:
         """Build comprehensive crime to section mappings for all jurisdictions"""
         mappings = {
@@ -154,6 +545,21 @@ class EnhancedLegalAdvisor:
         }
         return mappings
     
+    def _build_crime_sections(self) -> Dict[str, Dict[str, tuple]]:
+        """Resolve each crime mapping to its sections, in database order"""
+        crime_sections = {}
+        for jurisdiction, crimes in self.crime_mappings.items():
+            crime_sections[jurisdiction] = {}
+            for crime, section_numbers in crimes.items():
+                hits = [
+                    hit
+                    for number in set(section_numbers)
+                    for hit in self.sections_by_number.get((jurisdiction, number), ())
+                ]
+                hits.sort(key=itemgetter(0))
+                crime_sections[jurisdiction][crime] = tuple(section for _, section in hits)
+        return crime_sections
+    
     def _detect_jurisdiction(self, query: str, hint: Optional[str] = None) -> str:
         """Enhanced jurisdiction detection with comprehensive keyword matching"""
         if hint:
@@ -166,25 +572,10 @@ class EnhancedLegalAdvisor:
                 return 'UAE'
         
         # Enhanced detection from query content
-        query_lower = query.lower()
-        
-        # India indicators
-        india_keywords = ['india', 'indian', 'ipc', 'crpc', 'bns', 'bharatiya', 'nyaya', 'sanhita', 
-                         'delhi', 'mumbai', 'bangalore', 'chennai', 'kolkata', 'hyderabad',
-                         'supreme court of india', 'high court', 'magistrate', 'fir', 'police station']
-        
-        # UK indicators  
-        uk_keywords = ['uk', 'britain', 'england', 'scotland', 'wales', 'london', 'manchester',
-                      'crown court', 'magistrates court', 'british', 'english law', 'cps',
-                      'crown prosecution service', 'solicitor', 'barrister']
-        
-        # UAE indicators
-        uae_keywords = ['uae', 'emirates', 'dubai', 'abu dhabi', 'sharjah', 'ajman', 'ras al khaimah',
-                       'fujairah', 'umm al quwain', 'federal law', 'sharia', 'dirhams', 'aed']
-        
-        india_score = sum(1 for keyword in india_keywords if keyword in query_lower)
-        uk_score = sum(1 for keyword in uk_keywords if keyword in query_lower)
-        uae_score = sum(1 for keyword in uae_keywords if keyword in query_lower)
+        scores = self._jurisdiction_matcher.count(query.lower())
+        india_score = scores['IN']
+        uk_score = scores['UK']
+        uae_score = scores['UAE']
         
         if india_score > uk_score and india_score > uae_score:
             return 'IN'
@@ -200,43 +591,7 @@ class EnhancedLegalAdvisor:
         if hint:
             return hint.lower()
         
-        query_lower = query.lower()
-        
-        # Criminal law indicators
-        criminal_keywords = ['theft', 'murder', 'assault', 'rape', 'robbery', 'burglary', 'fraud',
-                           'kidnapping', 'extortion', 'criminal', 'crime', 'police', 'arrest',
-                           'fir', 'charge', 'prosecution', 'jail', 'prison', 'bail', 'custody',
-                           'investigation', 'evidence', 'witness', 'accused', 'defendant',
-                           'cybercrime', 'drugs', 'trafficking', 'terrorism', 'violence', 'suicide']
-        
-        # Civil law indicators
-        civil_keywords = ['contract', 'property', 'tort', 'damages', 'compensation', 'negligence',
-                         'breach', 'liability', 'dispute', 'claim', 'suit', 'plaintiff',
-                         'defendant', 'injunction', 'specific performance', 'restitution',
-                         'employment', 'landlord', 'tenant', 'consumer', 'insurance']
-        
-        # Family law indicators
-        family_keywords = ['marriage', 'divorce', 'custody', 'family', 'child', 'adoption',
-                          'maintenance', 'alimony', 'dowry', 'domestic violence', 'separation',
-                          'matrimonial', 'guardianship', 'inheritance', 'succession', 'will']
-        
-        # Commercial law indicators
-        commercial_keywords = ['company', 'business', 'commercial', 'corporate', 'partnership',
-                              'llc', 'limited liability', 'shares', 'shareholders', 'directors',
-                              'merger', 'acquisition', 'bankruptcy', 'insolvency', 'trade',
-                              'intellectual property', 'patent', 'trademark', 'copyright']
-        
-        criminal_score = sum(1 for keyword in criminal_keywords if keyword in query_lower)
-        civil_score = sum(1 for keyword in civil_keywords if keyword in query_lower)
-        family_score = sum(1 for keyword in family_keywords if keyword in query_lower)
-        commercial_score = sum(1 for keyword in commercial_keywords if keyword in query_lower)
-        
-        scores = {
-            'criminal': criminal_score,
-            'civil': civil_score,
-            'family': family_score,
-            'commercial': commercial_score
-        }
+        scores = self._domain_matcher.count(query.lower())
         
         max_domain = max(scores, key=scores.get)
         if scores[max_domain] > 0:
@@ -244,28 +599,59 @@ class EnhancedLegalAdvisor:
         
         return 'civil'  # Default
     
+    def _get_statute_resolver(self):
+        """Return the shared StatuteResolver, creating it on first use"""
+        if self._statute_resolver is None:
+            from core.ontology.statute_resolver import StatuteResolver
+            self._statute_resolver = StatuteResolver()
+        return self._statute_resolver
+    
+    def _find_statute_section(self, section_number: str, act: str) -> Optional[Section]:
+        """First section in database order with this number whose act_id contains act"""
+        hits = [
+            hit
+            for jurisdiction in self.jurisdiction_sections
+            for hit in self.sections_by_number.get((jurisdiction, section_number), ())
+        ]
+        hits.sort(key=itemgetter(0))
+        act_lower = act.lower()
+        for _, section in hits:
+            if act_lower in section.act_id.lower():
+                return section
+        return None
+    
+    def clear_cache(self) -> None:
+        """Drop memoized search results"""
+        self._cached_advisor_sections.cache_clear()
+        self._cached_statute_sections.cache_clear()
+    
+    def _advisor_sections(self, query: str, jurisdiction: str, domain: str) -> tuple:
+        return tuple(self._search_relevant_sections(query, jurisdiction, domain))
+    
+    def _statute_sections(self, query: str, jurisdiction: str, domain: str) -> tuple:
+        """Database sections for the statutes the StatuteResolver returns"""
+        statute_resolver = self._get_statute_resolver()
+        statute_result = statute_resolver.resolve_query(query, [domain], jurisdiction)
+        
+        # Convert statute results to sections
+        statute_sections = []
+        for statute_data in statute_result.get('statutes', []):
+            # Find matching section in our database
+            section = self._find_statute_section(statute_data['section'], statute_data['act'])
+            if section is not None:
+                statute_sections.append(section)
+        return tuple(statute_sections)
+    
     def multi_strategy_search(self, query: str, jurisdiction: str, domain: str) -> List[Section]:
         """Multi-strategy search combining enhanced legal advisor and statute retriever"""
         print("STATUTE RETRIEVER EXECUTED")
         
         # Strategy 1: Use enhanced legal advisor search
-        advisor_sections = self._search_relevant_sections(query, jurisdiction, domain)
+        advisor_sections = list(self._cached_advisor_sections(query, jurisdiction, domain))
         
         # Strategy 2: Use statute retriever for additional statutes
         try:
-            from core.ontology.statute_resolver import StatuteResolver
-            statute_resolver = StatuteResolver()
-            statute_result = statute_resolver.resolve_query(query, [domain], jurisdiction)
-            
-            # Convert statute results to sections
-            statute_sections = []
-            for statute_data in statute_result.get('statutes', []):
-                # Find matching section in our database
-                for section in self.sections:
-                    if (section.section_number == statute_data['section'] and 
-                        statute_data['act'].lower() in section.act_id.lower()):
-                        statute_sections.append(section)
-                        break
+            statute_sections = self._cached_statute_sections(query, jurisdiction, domain)
             
             # Merge results, prioritizing advisor sections
             all_sections = advisor_sections[:]
@@ -287,60 +673,55 @@ class EnhancedLegalAdvisor:
         # Strategy 1: Direct crime mapping using offense subtypes
         matched_sections = []
         if jurisdiction in self.crime_mappings:
-            for crime, section_numbers in self.crime_mappings[jurisdiction].items():
-                if crime in query_lower or any(word in query_lower for word in crime.split('_')):
-                    for section in self.sections:
-                        if (section.jurisdiction.value == jurisdiction and 
-                            section.section_number in section_numbers):
-                            matched_sections.append((section, 15))  # Highest priority
+            # A crime matches on its key or on any word of it
+            crime_hits = self._crime_matchers[jurisdiction].count(query_lower)
+            for crime, sections in self.crime_sections[jurisdiction].items():
+                if crime_hits[crime]:
+                    # Database order decides ties in the final ranking
+                    for section in sections:
+                        matched_sections.append((section, 15))  # Highest priority
         
         # Strategy 2: Keyword matching in section text
         query_words = set(word.lower() for word in query.split() if len(word) > 2)
+        keyword_index = self.jurisdiction_section_index.get(jurisdiction, {})
+        domain_bonuses = self.domain_bonuses.get(domain, {})
+        # A section's score does not depend on which query word found it, so
+        # each section is scored once, at its first posting
+        scored = set()
         for word in query_words:
-            if word in self.section_index:
-                for section in self.section_index[word]:
-                    if section.jurisdiction.value == jurisdiction:
-                        # Calculate relevance score
-                        score = 0
-                        section_text_lower = section.text.lower()
-                        
-                        # Exact word matches
-                        for query_word in query_words:
-                            if query_word in section_text_lower:
-                                score += 5
-                        
-                        # Partial matches
-                        for query_word in query_words:
-                            if any(query_word in word for word in section_text_lower.split()):
-                                score += 2
-                        
-                        # Domain relevance boost
-                        domain_keywords = {
-                            'criminal': ['offence', 'punishment', 'imprisonment', 'fine', 'criminal'],
-                            'civil': ['damages', 'compensation', 'liability', 'breach', 'contract'],
-                            'family': ['marriage', 'divorce', 'custody', 'family', 'matrimonial'],
-                            'commercial': ['company', 'business', 'commercial', 'trade', 'corporate']
-                        }
-                        
-                        if domain in domain_keywords:
-                            for domain_word in domain_keywords[domain]:
-                                if domain_word in section_text_lower:
-                                    score += 3
-                        
-                        if score > 0:
-                            matched_sections.append((section, score))
+            if word in keyword_index:
+                for section in keyword_index[word]:
+                    if id(section) in scored:
+                        continue
+                    scored.add(id(section))
+                    
+                    # Calculate relevance score
+                    score = 0
+                    section_text_lower = section.text_lower
+                    
+                    # Exact word matches (5) and partial matches (2). Query
+                    # words contain no whitespace, so a query word found in
+                    # the text always lies inside one of the text's words
+                    # and both bonuses apply together.
+                    for query_word in query_words:
+                        if query_word in section_text_lower:
+                            score += 5 + 2
+                    
+                    # Domain relevance boost
+                    score += domain_bonuses.get(id(section), 0)
+                    
+                    if score > 0:
+                        matched_sections.append((section, score))
         
         # Strategy 3: Metadata matching
-        for section in self.jurisdiction_sections.get(jurisdiction, []):
-            if hasattr(section, 'metadata') and section.metadata:
-                metadata_text = str(section.metadata).lower()
-                score = 0
-                for word in query_words:
-                    if word in metadata_text:
-                        score += 4
-                
-                if score > 0:
-                    matched_sections.append((section, score))
+        for section, metadata_text in self.metadata_texts.get(jurisdiction, []):
+            score = 0
+            for word in query_words:
+                if word in metadata_text:
+                    score += 4
+            
+            if score > 0:
+                matched_sections.append((section, score))
         
         # Remove duplicates and sort by relevance
         unique_sections = {}
@@ -352,9 +733,10 @@ class EnhancedLegalAdvisor:
                 if score > unique_sections[section.section_id][1]:
                     unique_sections[section.section_id] = (section, score)
         
-        # Sort by relevance and return top 10
-        sorted_sections = sorted(unique_sections.values(), key=lambda x: x[1], reverse=True)
-        return [section for section, score in sorted_sections[:10]]
+        # Return the top 10 by relevance; nlargest keeps ties in insertion
+        # order, like a stable sort
+        top_sections = heapq.nlargest(10, unique_sections.values(), key=itemgetter(1))
+        return [section for section, score in top_sections]
     
     def _generate_legal_analysis(self, query: str, sections: List[Section], jurisdiction: str) -> str:
         """Generate comprehensive legal analysis based on relevant sections"""
@@ -447,8 +829,8 @@ class EnhancedLegalAdvisor:
                                '63' in s.section_number or '64' in s.section_number or
                                'rape' in s.section_id.lower() for s in sections)
         
-        is_serious_crime = any(word in s.text.lower() for s in sections 
-                              for word in ['murder', 'homicide', 'terrorism', 'trafficking'])
+        is_serious_crime = any(word in s.text_lower for s in sections 
+                              for word in SERIOUS_CRIME_KEYWORDS)
         
         if domain == 'criminal':
             if jurisdiction == 'IN':
@@ -579,124 +961,39 @@ class EnhancedLegalAdvisor:
                                '63' in s.section_number or '64' in s.section_number or
                                'rape' in s.section_id.lower() for s in sections)
         
-        is_serious_crime = any(word in s.text.lower() for s in sections 
-                              for word in ['murder', 'homicide', 'terrorism', 'trafficking'])
+        is_serious_crime = False
+        for section in sections:
+            serious = self.serious_crime_flags.get(id(section))
+            if serious is None:
+                # Not one of the loaded sections
+                serious = any(word in section.text_lower for word in SERIOUS_CRIME_KEYWORDS)
+            if serious:
+                is_serious_crime = True
+                break
         
         if is_sexual_offence:
-            if jurisdiction == 'IN':
-                remedies = [
-                    "🔒 Criminal prosecution with rigorous imprisonment (minimum 7 years, may extend to life)",
-                    "💰 Compensation under Section 357A CrPC (up to ₹10 lakhs)",
-                    "⚖️  Free legal aid under Legal Services Authorities Act",
-                    "🛡️  Protection under Witness Protection Scheme",
-                    "🏥 Medical treatment at government expense",
-                    "🏠 Shelter and rehabilitation services",
-                    "📞 24/7 helpline support (1091 Women Helpline)"
-                ]
-            elif jurisdiction == 'UK':
-                remedies = [
-                    "🔒 Criminal prosecution with life imprisonment possible",
-                    "💰 Criminal Injuries Compensation Authority (CICA) claim",
-                    "⚖️  Special measures for vulnerable witnesses",
-                    "🛡️  Restraining orders and protection",
-                    "🏥 NHS counseling and medical support"
-                ]
-            elif jurisdiction == 'UAE':
-                remedies = [
-                    "🔒 Criminal prosecution with severe penalties",
-                    "💰 Diya (blood money) compensation",
-                    "⚖️  Court-ordered compensation",
-                    "🛡️  Protection orders",
-                    "🏥 Medical and psychological support"
-                ]
+            remedies = _jurisdiction_remedies(SEXUAL_OFFENCE_REMEDIES, jurisdiction)
         
         elif is_serious_crime:
-            if jurisdiction == 'IN':
-                remedies = [
-                    "🔒 Criminal prosecution with life imprisonment/death penalty",
-                    "💰 Victim compensation under CrPC",
-                    "⚖️  Free legal aid",
-                    "🛡️  Witness protection",
-                    "📈 Appeal to higher courts"
-                ]
-            else:
-                remedies = [
-                    "🔒 Criminal prosecution with maximum penalties",
-                    "💰 Victim compensation schemes",
-                    "⚖️  Legal aid and support",
-                    "🛡️  Protection measures"
-                ]
+            remedies = _jurisdiction_remedies(SERIOUS_CRIME_REMEDIES, jurisdiction)
         
         else:
             # Extract remedies from section metadata
             for section in sections:
-                if hasattr(section, 'metadata') and section.metadata:
-                    if 'civil_remedies' in section.metadata:
-                        section_remedies = section.metadata['civil_remedies']
-                        if isinstance(section_remedies, list):
-                            remedies.extend([f"⚖️  {remedy}" for remedy in section_remedies])
-                        else:
-                            remedies.append(f"⚖️  {section_remedies}")
-                    
-                    if 'punishment' in section.metadata:
-                        remedies.append(f"🔒 Criminal: {section.metadata['punishment']}")
+                section_remedies = self.metadata_remedies.get(id(section))
+                if section_remedies is None:
+                    # Not one of the loaded sections
+                    section_remedies = _metadata_remedies(section)
+                remedies.extend(section_remedies)
+                if len(remedies) >= MAX_REMEDIES:
+                    # Later sections could only add remedies past the cap
+                    break
             
             # Default remedies by domain if none found
             if not remedies:
-                if domain == 'criminal':
-                    if jurisdiction == 'IN':
-                        remedies = [
-                            "🔒 Criminal prosecution and imprisonment/fine as per law",
-                            "💰 Compensation under Section 357A CrPC",
-                            "⚖️  Legal aid if eligible"
-                        ]
-                    elif jurisdiction == 'UK':
-                        remedies = [
-                            "🔒 Criminal prosecution and sentencing",
-                            "💰 Criminal Injuries Compensation",
-                            "⚖️  Legal aid if eligible"
-                        ]
-                    elif jurisdiction == 'UAE':
-                        remedies = [
-                            "🔒 Criminal prosecution and penalties",
-                            "💰 Court-ordered compensation",
-                            "⚖️  Legal representation"
-                        ]
-                
-                elif domain == 'civil':
-                    remedies = [
-                        "💰 Monetary damages and compensation",
-                        "⚖️  Specific performance of contract",
-                        "🚫 Injunctive relief",
-                        "🔄 Restitution and restoration"
-                    ]
-                
-                elif domain == 'family':
-                    if jurisdiction == 'IN':
-                        remedies = [
-                            "👨👩👧👦 Child custody and visitation rights",
-                            "💰 Maintenance and alimony",
-                            "🏠 Property settlement",
-                            "🛡️  Protection orders if needed"
-                        ]
-                    else:
-                        remedies = [
-                            "👨👩👧👦 Child arrangements orders",
-                            "💰 Financial settlements",
-                            "🏠 Property division",
-                            "🛡️  Non-molestation orders"
-                        ]
-                
-                elif domain == 'commercial':
-                    remedies = [
-                        "💰 Breach of contract damages",
-                        "⚖️  Specific performance",
-                        "🚫 Injunctive relief",
-                        "🔄 Rescission and restitution",
-                        "📊 Account of profits"
-                    ]
+                remedies = _jurisdiction_remedies(DOMAIN_REMEDIES.get(domain, {}), jurisdiction)
         
-        return remedies[:8]  # Limit to top 8 remedies
+        return remedies[:MAX_REMEDIES]  # Limit to top 8 remedies
     
     def _log_enforcement_event(self, event_type: str, trace_id: str, details: Dict[str, Any]):
         """Log enforcement event to ledger"""
@@ -711,14 +1008,18 @@ class EnhancedLegalAdvisor:
         }
         
         # Calculate hash
-        event_str = json.dumps(event, sort_keys=True)
+        event_str = _LEDGER_ENCODER.encode(event)
         event["hash"] = hashlib.sha256(event_str.encode()).hexdigest()
         
         self.enforcement_ledger.append(event)
     
     def provide_legal_advice(self, legal_query: LegalQuery) -> LegalAdvice:
         """Main method to provide comprehensive legal advice"""
-        trace_id = legal_query.trace_id or f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        # One clock reading stamps the trace id and the advice; ledger events
+        # are stamped as they are logged, so they show when each step ran
+        now = datetime.now()
+        timestamp = now.isoformat()
+        trace_id = legal_query.trace_id or f"trace_{now.strftime('%Y%m%d_%H%M%S_%f')}"
         
         # Log query received
         self._log_enforcement_event("query_received", trace_id, {
@@ -754,13 +1055,15 @@ class EnhancedLegalAdvisor:
             confidence_score += min(0.6, len(relevant_sections) * 0.1)
             
             # Boost for exact matches
-            query_lower = legal_query.query_text.lower()
+            query_words = [word for word in legal_query.query_text.lower().split() if len(word) > 3]
             for section in relevant_sections:
-                if any(word in section.text.lower() for word in query_lower.split() if len(word) > 3):
+                section_text_lower = section.text_lower
+                if any(word in section_text_lower for word in query_words):
                     confidence_score += 0.05
             
             # Boost for jurisdiction-specific sections
-            jurisdiction_sections_count = len([s for s in relevant_sections if s.jurisdiction.value == jurisdiction])
+            jurisdiction_member = JURISDICTION_BY_VALUE.get(jurisdiction)
+            jurisdiction_sections_count = sum(1 for s in relevant_sections if s.jurisdiction is jurisdiction_member)
             confidence_score += min(0.2, jurisdiction_sections_count * 0.02)
             
             # Cap at 0.95
@@ -786,7 +1089,7 @@ class EnhancedLegalAdvisor:
             remedies=remedies,
             confidence_score=confidence_score,
             trace_id=trace_id,
-            timestamp=datetime.now().isoformat()
+            timestamp=timestamp
         )
     
     def save_enforcement_ledger(self, filename: str = "enhanced_legal_advice_ledger.json"):
@@ -798,10 +1101,11 @@ class EnhancedLegalAdvisor:
         """Get comprehensive system statistics"""
         jurisdiction_stats = {}
         for jurisdiction, sections in self.jurisdiction_sections.items():
+            act_ids = {s.act_id for s in sections}
             jurisdiction_stats[jurisdiction] = {
                 "total_sections": len(sections),
-                "acts": len(set(s.act_id for s in sections)),
-                "sample_acts": list(set(s.act_id for s in sections))[:5]
+                "acts": len(act_ids),
+                "sample_acts": list(act_ids)[:5]
             }
         
         return {
@@ -844,45 +1148,52 @@ def main():
     print("🏛️  ENHANCED NYAYA AI LEGAL ADVISOR - COMPREHENSIVE TESTING")
     print(f"{'='*80}\n")
     
+    # Advice per query (None if it failed), reused for the final statistics
+    advices = []
     for i, query in enumerate(test_queries, 1):
         print(f"📋 Query {i}: {query.query_text}")
         print(f"{'─'*80}")
         
+        # The rest of the report is collected and written once per query
+        out = []
+        advice = None
         try:
             advice = advisor.provide_legal_advice(query)
             
-            print(f"🌍 Jurisdiction: {advice.jurisdiction}")
-            print(f"⚖️  Domain: {advice.domain}")
-            print(f"📊 Confidence: {advice.confidence_score:.2f}")
-            print(f"📚 Relevant Sections Found: {len(advice.relevant_sections)}")
+            out.append(f"🌍 Jurisdiction: {advice.jurisdiction}")
+            out.append(f"⚖️  Domain: {advice.domain}")
+            out.append(f"📊 Confidence: {advice.confidence_score:.2f}")
+            out.append(f"📚 Relevant Sections Found: {len(advice.relevant_sections)}")
             
             if advice.relevant_sections:
-                print(f"\n📖 Top Relevant Sections:")
+                out.append(f"\n📖 Top Relevant Sections:")
                 for j, section in enumerate(advice.relevant_sections[:3], 1):
-                    print(f"   {j}. Section {section.section_number}: {section.text[:100]}...")
+                    out.append(f"   {j}. Section {section.section_number}: {section.text[:100]}...")
             
-            print(f"\n📝 Legal Analysis Preview:")
+            out.append(f"\n📝 Legal Analysis Preview:")
             analysis_preview = advice.legal_analysis[:400] + "..." if len(advice.legal_analysis) > 400 else advice.legal_analysis
-            print(f"   {analysis_preview}")
+            out.append(f"   {analysis_preview}")
             
-            print(f"\n🔄 Procedural Steps ({len(advice.procedural_steps)} total):")
+            out.append(f"\n🔄 Procedural Steps ({len(advice.procedural_steps)} total):")
             for step in advice.procedural_steps[:4]:
-                print(f"   • {step}")
+                out.append(f"   • {step}")
             if len(advice.procedural_steps) > 4:
-                print(f"   ... and {len(advice.procedural_steps) - 4} more steps")
+                out.append(f"   ... and {len(advice.procedural_steps) - 4} more steps")
             
-            print(f"\n⚖️  Available Remedies ({len(advice.remedies)} total):")
+            out.append(f"\n⚖️  Available Remedies ({len(advice.remedies)} total):")
             for remedy in advice.remedies[:4]:
-                print(f"   • {remedy}")
+                out.append(f"   • {remedy}")
             if len(advice.remedies) > 4:
-                print(f"   ... and {len(advice.remedies) - 4} more remedies")
+                out.append(f"   ... and {len(advice.remedies) - 4} more remedies")
             
-            print(f"\n🔍 Trace ID: {advice.trace_id}")
+            out.append(f"\n🔍 Trace ID: {advice.trace_id}")
             
         except Exception as e:
-            print(f"❌ Error processing query: {str(e)}")
+            out.append(f"❌ Error processing query: {str(e)}")
         
-        print(f"\n{'='*80}\n")
+        advices.append(advice)
+        out.append(f"\n{'='*80}\n")
+        print('\n'.join(out))
     
     # Save enforcement ledger
     advisor.save_enforcement_ledger()
@@ -891,7 +1202,7 @@ def main():
     # Display final statistics
     print(f"\n📈 Final System Performance:")
     print(f"   Queries Processed: {len(test_queries)}")
-    print(f"   Average Sections per Query: {sum(len(advisor.provide_legal_advice(q).relevant_sections) for q in test_queries[:3]) / 3:.1f}")
+    print(f"   Average Sections per Query: {sum(len(advice.relevant_sections) for advice in advices[:3] if advice) / 3:.1f}")
     print(f"   Jurisdictions Covered: {len(stats['jurisdictions'])}")
     print(f"   Total Legal Database Size: {stats['total_sections']} sections")
 
@@ -3,14 +3,42 @@
 Enhanced Legal Query Analyzer
 Uses comprehensive database (1,693 sections + procedures) for accurate legal analysis
 """
+import copy
 import json
 import os
-from typing import Dict, List, Any
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, Any, FrozenSet
+
+# Query fragments whose matching sections are remembered between queries
+FRAGMENT_CACHE_SIZE = 4096
+
+# Normalized queries whose analysis is remembered between calls
+ANALYSIS_CACHE_SIZE = 512
+
+# Keys under which a database file holds its sections, checked in this order
+SECTION_CONTAINERS = (("key_sections", "IPC"), ("structure", "BNS"))
+
+# Terms that make a section relevant on their own when both query and text mention them
+PRIORITY_TERMS = ('rape', 'murder', 'theft', 'assault', 'dowry', 'divorce', 'harassment')
+
+# Query keywords a section must contain to be relevant without a priority term
+MIN_KEYWORD_HITS = 2
+
+def _matches_relevance_rule(priority_hit: bool, keyword_hits: int) -> bool:
+    """Whether a section is relevant, given if it shares a priority term with
+    the query and how many query keywords it contains"""
+    return priority_hit or keyword_hits >= MIN_KEYWORD_HITS
 
 class EnhancedLegalQueryAnalyzer:
     def __init__(self):
         self.main_db = {}
         self.procedure_db = {}
+        self.sections_flat = []
+        self.postings = {}
+        self.sections_by_number = {}
+        self._cached_sections_containing = lru_cache(maxsize=FRAGMENT_CACHE_SIZE)(self._sections_containing)
+        self._cached_analysis = lru_cache(maxsize=ANALYSIS_CACHE_SIZE)(self._analyze_normalized_query)
         self.load_databases()
         
     def load_databases(self):
@@ -42,9 +70,71 @@ class EnhancedLegalQueryAnalyzer:
                                     self.procedure_db[jurisdiction][domain] = json.load(f)
                             except Exception as e:
                                 continue
+        
+        self.build_section_index()
+        self._cached_analysis.cache_clear()
+    
+    def build_section_index(self):
+        """Flatten the IPC/BNS sections of the main database and index them once.
+        
+        Sections keep the order in which a walk over main_db visits them, so
+        results built from sorted positions match a file-by-file scan.
+        Postings map each whitespace-separated word of a section's lowercased
+        text to the positions containing it; query keywords never contain
+        whitespace, so a keyword occurs in a text exactly when it occurs in
+        one of its words.
+        """
+        self.sections_flat = []
+        for filename, data in self.main_db.items():
+            if not isinstance(data, dict):
+                continue
+            for container, act in SECTION_CONTAINERS:
+                if container in data:
+                    for category, category_sections in data[container].items():
+                        if isinstance(category_sections, dict):
+                            for num, text in category_sections.items():
+                                self.sections_flat.append({
+                                    "section_number": num,
+                                    "text": text,
+                                    "text_lower": text.lower() if isinstance(text, str) else None,
+                                    "act": act,
+                                    "category": category,
+                                    "file": filename
+                                })
+                    break
+        
+        postings = defaultdict(list)
+        sections_by_number = defaultdict(list)
+        for position, section in enumerate(self.sections_flat):
+            sections_by_number[section["section_number"]].append(position)
+            if section["text_lower"] is not None:
+                for word in dict.fromkeys(section["text_lower"].split()):
+                    postings[word].append(position)
+        self.postings = dict(postings)
+        self.sections_by_number = dict(sections_by_number)
+        self._cached_sections_containing.cache_clear()
+    
+    def _sections_containing(self, fragment: str) -> FrozenSet[int]:
+        """Positions of the sections whose lowercased text contains fragment"""
+        positions = set()
+        for word, word_positions in self.postings.items():
+            if fragment in word:
+                positions.update(word_positions)
+        return frozenset(positions)
     
     def analyze_legal_query(self, query: str) -> Dict[str, Any]:
-        """Comprehensive legal query analysis"""
+        """Comprehensive legal query analysis.
+        
+        Every step reads the query case-insensitively, so the analysis is
+        memoized on the stripped, lowercased query. Each call gets its own
+        deep copy, so callers may modify the result without affecting the memo.
+        """
+        analysis = copy.deepcopy(self._cached_analysis(query.strip().lower()))
+        analysis["query"] = query
+        return analysis
+    
+    def _analyze_normalized_query(self, query: str) -> Dict[str, Any]:
+        """Analysis of a stripped, lowercased query"""
         # Search main database for relevant sections
         main_results = self.search_legal_sections(query)
         
@@ -84,22 +174,41 @@ class EnhancedLegalQueryAnalyzer:
             'harassment': ['75', '354A', '509']
         }
         
+        # Relevant sections keyed by (act, section number); the first match wins
+        unique_sections = {}
+        
         # Direct crime mapping
         for crime, sections in crime_mappings.items():
             if crime in query_lower:
-                results["relevant_sections"].extend(self.find_sections_by_numbers(sections, crime))
-        
-        # Keyword-based search through all files
-        for filename, data in self.main_db.items():
-            file_sections = self.extract_sections_from_file(filename, data, keywords, query_lower)
-            results["relevant_sections"].extend(file_sections)
-        
-        # Remove duplicates and organize
-        unique_sections = {}
-        for section in results["relevant_sections"]:
-            key = f"{section['act']}_{section['section_number']}"
+                for section in self.find_sections_by_numbers(sections, crime):
+                    unique_sections.setdefault((section["act"], section["section_number"]), section)
+        
+        # Keyword-based search: the same relevance rule as is_section_relevant,
+        # fed with priority-term and keyword hits counted from the index
+        priority_positions = set()
+        for term in PRIORITY_TERMS:
+            if term in query_lower:
+                priority_positions.update(self._cached_sections_containing(term))
+        keyword_hits = Counter()
+        for keyword in keywords:
+            keyword_hits.update(self._cached_sections_containing(keyword))
+        relevant_positions = [
+            position for position in priority_positions.union(keyword_hits)
+            if _matches_relevance_rule(position in priority_positions, keyword_hits[position])
+        ]
+        
+        for position in sorted(relevant_positions):
+            section = self.sections_flat[position]
+            key = (section["act"], section["section_number"])
             if key not in unique_sections:
-                unique_sections[key] = section
+                unique_sections[key] = {
+                    "section_number": section["section_number"],
+                    "text": section["text"],
+                    "act": section["act"],
+                    "category": section["category"],
+                    "jurisdiction": "India",
+                    "file": section["file"]
+                }
         
         results["relevant_sections"] = list(unique_sections.values())
         results["total_sections"] = len(results["relevant_sections"])
@@ -121,41 +230,22 @@ class EnhancedLegalQueryAnalyzer:
     
     def find_sections_by_numbers(self, section_numbers: List[str], crime_type: str) -> List[Dict]:
         """Find specific sections by their numbers"""
-        found_sections = []
+        positions = set()
+        for num in section_numbers:
+            positions.update(self.sections_by_number.get(num, ()))
         
-        for filename, data in self.main_db.items():
-            if isinstance(data, dict):
-                # Search in IPC structure
-                if "key_sections" in data:
-                    for category, sections in data["key_sections"].items():
-                        if isinstance(sections, dict):
-                            for num, text in sections.items():
-                                if num in section_numbers:
-                                    found_sections.append({
-                                        "section_number": num,
-                                        "text": text,
-                                        "act": "IPC",
-                                        "category": category,
-                                        "jurisdiction": "India",
-                                        "relevance": "Direct match",
-                                        "crime_type": crime_type
-                                    })
-                
-                # Search in BNS structure
-                elif "structure" in data:
-                    for category, sections in data["structure"].items():
-                        if isinstance(sections, dict):
-                            for num, text in sections.items():
-                                if num in section_numbers:
-                                    found_sections.append({
-                                        "section_number": num,
-                                        "text": text,
-                                        "act": "BNS",
-                                        "category": category,
-                                        "jurisdiction": "India",
-                                        "relevance": "Direct match",
-                                        "crime_type": crime_type
-                                    })
+        found_sections = []
+        for position in sorted(positions):
+            section = self.sections_flat[position]
+            found_sections.append({
+                "section_number": section["section_number"],
+                "text": section["text"],
+                "act": section["act"],
+                "category": section["category"],
+                "jurisdiction": "India",
+                "relevance": "Direct match",
+                "crime_type": crime_type
+            })
         
         return found_sections
     
@@ -199,14 +289,11 @@ class EnhancedLegalQueryAnalyzer:
         text_lower = text.lower()
         
         # High-priority terms
-        priority_terms = ['rape', 'murder', 'theft', 'assault', 'dowry', 'divorce', 'harassment']
-        for term in priority_terms:
-            if term in query_lower and term in text_lower:
-                return True
+        priority_hit = any(term in query_lower and term in text_lower for term in PRIORITY_TERMS)
         
         # Keyword matching
         matches = sum(1 for keyword in keywords if keyword in text_lower)
-        return matches >= 2
+        return _matches_relevance_rule(priority_hit, matches)
     
     def search_procedures(self, query: str) -> Dict[str, Any]:
         """Search procedure datasets"""
@@ -1,10 +1,9 @@
-import json
 from datetime import datetime
 from collections import Counter, defaultdict
+from enforcement_provenance.ledger import load_ledger_entries
 
 def analyze_enforcement_ledger(file_path):
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    data = load_ledger_entries(file_path)
     
     # Basic stats
     total_entries = len(data)
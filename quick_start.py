@@ -64,9 +64,8 @@ def test_system():
     
     print("Testing Enforcement Ledger...")
     try:
-        import json
-        with open('Nyaya_AI/enforcement_ledger.json') as f:
-            data = json.load(f)
+        from enforcement_provenance.ledger import load_ledger_entries
+        data = load_ledger_entries('Nyaya_AI/enforcement_ledger.json')
         print(f"  Enforcement Ledger: OK ({len(data)} entries)")
     except Exception as e:
         print(f"  Enforcement Ledger: ERROR - {e}")
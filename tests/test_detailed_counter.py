@@ -0,0 +1,79 @@
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import detailed_counter
+from detailed_counter import count_sections_in_file, _load_skeleton
+
+DB_PATH = Path(__file__).parent.parent / "db"
+
+
+def _counts(filename, data):
+    sections, acts, structure_info = count_sections_in_file(filename, data)
+    return sections, sorted(acts), structure_info
+
+
+def test_section_key_acceptance():
+    print("=" * 80)
+    print("SECTION KEY TEST")
+    print("=" * 80)
+
+    keys = ["302", "1.1", "498A", "1.2.3", "12AB", "A1", "..5", "٥", "A", "AB", ".", "", "12C", "1 2", "x1"]
+    for key in keys:
+        expected = key.isdigit() or key.replace('.', '').replace('A', '').replace('B', '').isdigit()
+        assert bool(detailed_counter._is_section_key(key)) == expected, key
+    print("  [PASS] Section keys accepted as by the replace() check")
+
+
+def test_streamed_skeleton_matches_full_parse():
+    print("=" * 80)
+    print("STREAMED SKELETON TEST")
+    print("=" * 80)
+
+    if not detailed_counter.IJSON_AVAILABLE:
+        pytest.skip("ijson is not installed")
+
+    samples = {
+        "ipc.json": {"key_sections": {"crimes": {"302": {"title": "Murder"}, "498A": {}}, "note": "x"}},
+        "bns.json": {"structure": {"chapter_1": {"1": [1, 2], "2": None}, "chapter_2": []}},
+        "direct.json": {"sections": [{"id": 1, "text": {"deep": [1]}}, {"id": 2}]},
+        "generic.json": {"act": {"1.1": "a", "12AB": "b"}, "other": {"title": "c"}, "rules": [[], {}, 3]},
+        "list.json": [{"a": 1}, [2], 3],
+        "scalar.json": 42,
+        "empty.json": {},
+    }
+    for filename, data in samples.items():
+        skeleton = _load_skeleton(io.BytesIO(json.dumps(data).encode("utf-8")))
+        assert _counts(filename, skeleton) == _counts(filename, data), filename
+
+    for filepath in sorted(DB_PATH.glob("*.json")):
+        with open(filepath, "rb") as f:
+            skeleton = _load_skeleton(f)
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        assert _counts(filepath.name, skeleton) == _counts(filepath.name, data), filepath.name
+    print("  [PASS] Streamed skeleton counts match json.load counts")
+
+
+def test_detailed_count_returns_file_dicts():
+    print("=" * 80)
+    print("DETAILED COUNT RESULT TEST")
+    print("=" * 80)
+
+    total_sections, total_acts, file_details = detailed_counter.detailed_count()
+    assert file_details and all(type(detail) is dict for detail in file_details)
+    assert all(list(detail) == ['filename', 'sections', 'acts', 'structure_info'] for detail in file_details)
+    assert sum(detail['sections'] for detail in file_details) == total_sections
+    assert all(isinstance(info, str) for detail in file_details for info in detail['structure_info'])
+    print(f"  [PASS] {len(file_details)} file details returned as dicts")
+
+
+if __name__ == "__main__":
+    test_section_key_acceptance()
+    test_streamed_skeleton_matches_full_parse()
+    test_detailed_count_returns_file_dicts()
@@ -0,0 +1,291 @@
+import sys
+from pathlib import Path
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enforcement_engine.decision_model import DecisionContext, EnforcementDecision, EnforcementResult, EnforcementSignal, PolicySource
+from enforcement_engine.engine import SovereignEnforcementEngine
+from enforcement_engine import rules
+from enforcement_engine.rules import EnforcementRuleEngine, IntentClassificationRule, PatternMatcher
+from enforcement_engine.signer import EnforcementSigner
+
+
+def _context(user_request, case_id="case_1", trace_id="trace_1", confidence=0.7):
+    return DecisionContext(
+        case_id=case_id,
+        country="IN",
+        domain="criminal",
+        procedure_id="test",
+        original_confidence=confidence,
+        user_request=user_request,
+        jurisdiction_routed_to="IN",
+        trace_id=trace_id,
+        timestamp=datetime(2024, 1, 1)
+    )
+
+
+def test_decision_cache():
+    print("=" * 80)
+    print("ENFORCEMENT DECISION CACHE TEST")
+    print("=" * 80)
+
+    engine = EnforcementRuleEngine()
+    engine.clear_cache()
+
+    # Test 1: Repeated request with different ids reuses the cached decision
+    print("\n[Test 1] Cache hit across case/trace ids")
+    first = engine.evaluate_context(_context("What is the punishment for theft?"))
+    second = engine.evaluate_context(_context("What is the punishment for theft?", "case_2", "trace_2"))
+
+    assert first.final == EnforcementDecision.ALLOW_INFORMATIONAL
+    assert second is first
+    assert len(engine._trace_cache) == 1
+    print(f"  [PASS] {first.final.value} served from cache")
+
+    # Test 2: Fields the rules read are part of the key
+    print("\n[Test 2] Confidence changes the key")
+    engine.evaluate_context(_context("What is the punishment for theft?", confidence=0.1))
+    assert len(engine._trace_cache) == 2
+    print("  [PASS] Separate entry per confidence")
+
+    # Test 3: clear_cache empties the memo
+    print("\n[Test 3] clear_cache")
+    engine.clear_cache()
+    assert len(engine._trace_cache) == 0
+    print("  [PASS] Cache cleared")
+
+
+def test_restrict_is_not_masked_by_cache():
+    print("=" * 80)
+    print("ENFORCEMENT RESTRICT CACHE TEST")
+    print("=" * 80)
+
+    engine = EnforcementRuleEngine()
+    engine.clear_cache()
+
+    allowed = engine.evaluate_context(_context("What is the punishment for theft?"))
+    restricted = engine.evaluate_context(_context("how to get away with theft"))
+
+    assert allowed.final == EnforcementDecision.ALLOW_INFORMATIONAL
+    assert restricted.final == EnforcementDecision.RESTRICT
+    print("  [PASS] Distinct requests keep distinct decisions")
+
+
+def test_trace_reasoning():
+    print("=" * 80)
+    print("ENFORCEMENT TRACE REASONING TEST")
+    print("=" * 80)
+
+    engine = EnforcementRuleEngine()
+    trace = engine.evaluate_context(_context("how to get away with theft, bypass the rules"))
+
+    # Every rule is recorded, even after a RESTRICT
+    assert len(trace.per_rule) == len(engine.rules)
+    reasoning = engine.get_reasoning_for_decision(trace, trace.final)
+    assert "Classifies user intent" in reasoning
+    assert "Blocks requests that could compromise system integrity" in reasoning
+    print(f"  [PASS] {reasoning}")
+
+
+def test_pattern_matcher_matches_substring_semantics():
+    print("=" * 80)
+    print("PATTERN MATCHER TEST")
+    print("=" * 80)
+
+    patterns = ['how to get away', 'how to kill', 'how to', 'evade', 'gun']
+    matcher = PatternMatcher(patterns)
+    texts = [
+        "how to file a complaint",
+        "how do i evade tax",
+        "shotgun licence",
+        "what is theft",
+        "",
+    ]
+    for text in texts:
+        assert matcher.search(text) == any(p in text for p in patterns), text
+
+    assert PatternMatcher([]).search("anything") is False
+    print("  [PASS] Matcher agrees with substring checks")
+
+
+def test_pattern_matcher_automaton_matches_regex():
+    print("=" * 80)
+    print("PATTERN MATCHER AUTOMATON TEST")
+    print("=" * 80)
+
+    if not rules.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick is not installed")
+
+    patterns = ['how to get away', 'how to kill', 'how to', 'evade', 'gun']
+    matcher = PatternMatcher(patterns)
+    fallback = PatternMatcher(patterns)
+    fallback._automaton = None
+    assert matcher._automaton is not None
+    texts = [
+        "how to file a complaint",
+        "how do i evade tax",
+        "shotgun licence",
+        "what is theft",
+        "",
+    ]
+    for text in texts:
+        assert matcher.search(text) == fallback.search(text), text
+    print("  [PASS] Automaton agrees with the regex fallback")
+
+
+def test_batch_signing_matches_single_signing():
+    print("=" * 80)
+    print("ENFORCEMENT BATCH SIGNING TEST")
+    print("=" * 80)
+
+    signer = EnforcementSigner(secret_key="test_key")
+    results = [
+        EnforcementResult(
+            decision=decision,
+            rule_id=f"RULE-{i}",
+            policy_source=PolicySource.GOVERNANCE,
+            reasoning_summary="test",
+            trace_id=f"trace_{i}",
+            timestamp=datetime(2024, 1, 1),
+            signed_decision_object={},
+            proof_hash="hash"
+        )
+        for i, decision in enumerate(EnforcementDecision)
+    ]
+
+    batch = signer.sign_decisions_batch(results)
+    single = [signer.create_signed_decision_object(result)['signature'] for result in results]
+
+    assert batch == single
+    print(f"  [PASS] {len(batch)} batch signatures match")
+
+
+def test_result_to_dict_reflects_later_fields():
+    print("=" * 80)
+    print("ENFORCEMENT RESULT SERIALIZATION TEST")
+    print("=" * 80)
+
+    signer = EnforcementSigner(secret_key="test_key")
+    result = EnforcementResult(
+        decision=EnforcementDecision.ALLOW,
+        rule_id="RULE-1",
+        policy_source=PolicySource.GOVERNANCE,
+        reasoning_summary="test",
+        trace_id="trace_1",
+        timestamp=datetime(2024, 1, 1),
+        signed_decision_object={},
+        proof_hash=""
+    )
+    assert result.to_dict()["proof_hash"] == ""
+
+    # The engine signs a result after constructing it
+    result.signed_decision_object = signer.create_signed_decision_object(result)
+    result.proof_hash = "hash"
+    summary = result.to_dict()
+    assert summary["signed_decision_object"] == result.signed_decision_object
+    assert summary["proof_hash"] == "hash"
+    print("  [PASS] Serialization follows fields set after construction")
+
+
+def test_verify_signature_compares_hex_strings():
+    print("=" * 80)
+    print("ENFORCEMENT SIGNATURE VERIFICATION TEST")
+    print("=" * 80)
+
+    signer = EnforcementSigner(secret_key="test_key")
+    data = {"decision": "allow", "rule_id": "RULE-1"}
+    signature = signer.sign_decision(data)
+
+    assert signer.verify_signature(data, signature)
+    assert not signer.verify_signature({**data, "rule_id": "RULE-2"}, signature)
+    # Signatures are lowercase hex; other spellings are rejected, not decoded
+    assert not signer.verify_signature(data, signature.upper())
+    assert not signer.verify_signature(data, "zz" * 32)
+    assert not signer.verify_signature(data, signature[:-2])
+    print("  [PASS] Only the exact signature verifies")
+
+
+def _baseline_decision(rules, context):
+    """Final decision as the original rule-by-rule evaluator computed it"""
+    decisions = []
+    intent_decision = None
+    for rule in rules:
+        decision = rule.evaluate(context)
+        decisions.append(decision)
+        if isinstance(rule, IntentClassificationRule):
+            intent_decision = decision
+        if decision == EnforcementDecision.RESTRICT:
+            return decision
+    if intent_decision and intent_decision != EnforcementDecision.ALLOW:
+        return intent_decision
+    for decision in (EnforcementDecision.ALLOW_INFORMATIONAL, EnforcementDecision.SAFE_REDIRECT):
+        if decision in decisions:
+            return decision
+    return EnforcementDecision.ALLOW
+
+
+def test_evaluator_matches_baseline_precedence():
+    print("=" * 80)
+    print("RULE EVALUATOR PRECEDENCE TEST")
+    print("=" * 80)
+
+    engine = EnforcementRuleEngine()
+    requests = [
+        "What is the punishment for theft?",
+        "I was cheated. What can I do?",
+        "broke traffic rules",
+        "how to get away with murder",
+        "please bypass the rules",
+    ]
+    for request in requests:
+        for confidence in (0.1, 0.5, 0.9):
+            context = _context(request, confidence=confidence)
+            trace = engine._evaluate_rules(context)
+            assert trace.per_rule == tuple((rule, rule.evaluate(context)) for rule in engine.rules)
+            assert trace.final == _baseline_decision(engine.rules, context), request
+    print("  [PASS] Evaluator agrees with the original precedence")
+
+
+def test_rl_update_blocked_only_by_safety_restrict():
+    print("=" * 80)
+    print("RL UPDATE GATING TEST")
+    print("=" * 80)
+
+    engine = SovereignEnforcementEngine()
+
+    def signal(user_request, jurisdiction="IN"):
+        return EnforcementSignal(
+            case_id="case_1",
+            country="IN",
+            domain="criminal",
+            procedure_id="test",
+            original_confidence=0.7,
+            user_request=user_request,
+            jurisdiction_routed_to=jurisdiction,
+            trace_id="trace_1",
+            timestamp=datetime(2024, 1, 1)
+        )
+
+    # Governance restricts (INTENT-001, JURIS-001) do not block learning
+    assert engine.enforce_rl_update(signal("how to get away with theft")) is True
+    assert engine.enforce_rl_update(signal("What is theft?", jurisdiction="UK")) is True
+    # A SYSTEM_SAFETY restrict (SAFETY-001) does
+    assert engine.enforce_rl_update(signal("please bypass the rules")) is False
+    assert engine.enforce_rl_update(signal("What is the punishment for theft?")) is True
+    print("  [PASS] Only safety restricts block RL updates")
+
+
+if __name__ == "__main__":
+    test_decision_cache()
+    test_restrict_is_not_masked_by_cache()
+    test_trace_reasoning()
+    test_pattern_matcher_matches_substring_semantics()
+    test_pattern_matcher_automaton_matches_regex()
+    test_batch_signing_matches_single_signing()
+    test_result_to_dict_reflects_later_fields()
+    test_verify_signature_compares_hex_strings()
+    test_evaluator_matches_baseline_precedence()
+    test_rl_update_blocked_only_by_safety_restrict()
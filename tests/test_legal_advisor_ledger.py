@@ -0,0 +1,35 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from enhanced_legal_advisor import EnhancedLegalAdvisor, LegalQuery
+
+
+def test_ledger_save_matches_full_dump():
+    print("=" * 80)
+    print("ADVISOR LEDGER SAVE TEST")
+    print("=" * 80)
+
+    advisor = EnhancedLegalAdvisor()
+    path = Path(tempfile.mkdtemp()) / "ledger.json"
+
+    for query in ["What is the punishment for theft in Delhi?", "divorce in UK", "unknown matter"]:
+        advisor.provide_legal_advice(LegalQuery(query))
+        advisor.save_enforcement_ledger(str(path))
+        # Every save leaves the same bytes as a full json.dump
+        assert path.read_text() == json.dumps(advisor.enforcement_ledger, indent=2)
+    print(f"  [PASS] {len(advisor.enforcement_ledger)} events saved")
+
+    # A file changed by someone else is rewritten in full
+    path.write_text("[]")
+    advisor.provide_legal_advice(LegalQuery("robbery with weapon"))
+    advisor.save_enforcement_ledger(str(path))
+    assert json.loads(path.read_text()) == advisor.enforcement_ledger
+    print("  [PASS] Externally modified ledger rewritten in full")
+
+
+if __name__ == "__main__":
+    test_ledger_save_matches_full_dump()
@@ -0,0 +1,155 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import enhanced_legal_advisor
+from enhanced_legal_advisor import EnhancedLegalAdvisor, KeywordCounter, JURISDICTION_KEYWORDS, DOMAIN_KEYWORDS
+
+
+def test_keyword_counter_matches_substring_counts():
+    print("=" * 80)
+    print("KEYWORD COUNTER TEST")
+    print("=" * 80)
+
+    queries = [
+        "my landlord refuses to return deposit in london",
+        "fir not registered by police station in delhi",
+        "divorce procedure in dubai, abu dhabi and sharjah",
+        "bulk goods seized at the first checkpoint",
+        "defendant in a criminal and civil suit",
+        "",
+    ]
+    for categories in (JURISDICTION_KEYWORDS, DOMAIN_KEYWORDS):
+        counter = KeywordCounter(categories)
+        for query in queries:
+            expected = {
+                category: sum(1 for keyword in keywords if keyword in query)
+                for category, keywords in categories.items()
+            }
+            assert counter.count(query) == expected, query
+            assert list(counter.count(query)) == list(categories)
+    print("  [PASS] Counts agree with per-keyword substring checks")
+
+
+def test_keyword_counter_automaton_matches_fallback():
+    print("=" * 80)
+    print("KEYWORD COUNTER AUTOMATON TEST")
+    print("=" * 80)
+
+    if not enhanced_legal_advisor.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick is not installed")
+
+    # Overlapping keywords, a keyword shared by two categories and a
+    # keyword repeated within one category
+    categories = {
+        **JURISDICTION_KEYWORDS,
+        **DOMAIN_KEYWORDS,
+        "overlap": ("court", "courts", "our", "court"),
+        "shared": ("court", "police"),
+    }
+    queries = [
+        "my landlord refuses to return deposit in london",
+        "fir not registered by police station in delhi",
+        "the courts of our country and the high court",
+        "divorce procedure in dubai, abu dhabi and sharjah",
+        "",
+    ]
+    counter = KeywordCounter(categories)
+    fallback = KeywordCounter(categories)
+    fallback._automaton = None
+    assert counter._automaton is not None
+    for query in queries:
+        assert counter.count(query) == fallback.count(query), query
+    print("  [PASS] Automaton counts agree with the per-keyword fallback")
+
+
+def test_multi_strategy_search_cache():
+    print("=" * 80)
+    print("MULTI-STRATEGY SEARCH CACHE TEST")
+    print("=" * 80)
+
+    advisor = EnhancedLegalAdvisor()
+    query = "What is the punishment for theft?"
+    first = advisor.multi_strategy_search(query, "IN", "criminal")
+    second = advisor.multi_strategy_search(query, "IN", "criminal")
+
+    assert second == first
+    assert second is not first  # callers get their own list
+    assert advisor._cached_advisor_sections.cache_info().hits == 1
+
+    advisor.clear_cache()
+    assert advisor._cached_advisor_sections.cache_info().currsize == 0
+    assert advisor.multi_strategy_search(query, "IN", "criminal") == first
+    print(f"  [PASS] {len(first)} sections served from cache")
+
+
+def test_index_cache_round_trip():
+    print("=" * 80)
+    print("ADVISOR INDEX CACHE TEST")
+    print("=" * 80)
+
+    cache_dir = tempfile.mkdtemp()
+    assert EnhancedLegalAdvisor().index_cache_dir is None
+
+    built = EnhancedLegalAdvisor(index_cache_dir=cache_dir)
+    cache_files = os.listdir(cache_dir)
+    assert len(cache_files) == 1 and cache_files[0].endswith('.pkl')
+
+    cached = EnhancedLegalAdvisor(index_cache_dir=cache_dir)
+    assert cached.sections == built.sections
+    for query, jurisdiction, domain in [
+        ("What is the punishment for theft and murder?", "IN", "criminal"),
+        ("breach of contract damages", "UK", "civil"),
+        ("drugs possession article 39", "UAE", "criminal"),
+    ]:
+        expected = built._search_relevant_sections(query, jurisdiction, domain)
+        assert cached._search_relevant_sections(query, jurisdiction, domain) == expected, query
+
+    # A corrupt cache file is ignored and the indexes are rebuilt
+    cache_path = os.path.join(cache_dir, cache_files[0])
+    with open(cache_path, 'wb') as f:
+        f.write(b'not a pickle')
+    rebuilt = EnhancedLegalAdvisor(index_cache_dir=cache_dir)
+    assert rebuilt.sections == built.sections
+    assert os.listdir(cache_dir) == cache_files
+
+    # Editing any data_bridge module, not just the loader, invalidates the cache
+    case_module = str(Path(__file__).parent.parent / "data_bridge" / "schemas" / "case.py")
+    case_stat = os.stat(case_module)
+    try:
+        os.utime(case_module, ns=(case_stat.st_atime_ns, case_stat.st_mtime_ns + 1))
+        assert built._index_cache_path() != cache_path
+    finally:
+        os.utime(case_module, ns=(case_stat.st_atime_ns, case_stat.st_mtime_ns))
+    assert built._index_cache_path() == cache_path
+
+    # A database file that vanishes while fingerprinting means a fresh build
+    real_stat = os.stat
+    def stat(path, *args, **kwargs):
+        if str(path).endswith('.json'):
+            raise FileNotFoundError(path)
+        return real_stat(path, *args, **kwargs)
+    with mock.patch.object(enhanced_legal_advisor.os, "stat", side_effect=stat):
+        assert built._index_cache_path() is None
+        fresh = EnhancedLegalAdvisor(index_cache_dir=cache_dir)
+    assert fresh.sections == built.sections
+    assert os.listdir(cache_dir) == cache_files
+
+    # A state that cannot be pickled leaves no temporary file behind
+    rebuilt.metadata_texts = lambda: None
+    rebuilt._save_index_cache(os.path.join(cache_dir, "legal_index_unpicklable.pkl"))
+    assert os.listdir(cache_dir) == cache_files
+    print("  [PASS] Cached indexes give the same search results")
+
+
+if __name__ == "__main__":
+    test_keyword_counter_matches_substring_counts()
+    test_keyword_counter_automaton_matches_fallback()
+    test_multi_strategy_search_cache()
+    test_index_cache_round_trip()
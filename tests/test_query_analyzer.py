@@ -0,0 +1,134 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from final_enhanced_analyzer import EnhancedLegalQueryAnalyzer
+
+
+def _scan_main_db(analyzer, query):
+    """Sections a file-by-file scan of main_db finds by keyword, first per act and number"""
+    query_lower = query.lower()
+    keywords = set(word.lower() for word in query.split() if len(word) > 2)
+    sections = {}
+    for filename, data in analyzer.main_db.items():
+        for section in analyzer.extract_sections_from_file(filename, data, keywords, query_lower):
+            sections.setdefault((section["act"], section["section_number"]), section)
+    return list(sections.values())
+
+
+def test_indexed_search_matches_file_scan():
+    print("=" * 80)
+    print("QUERY ANALYZER INDEX TEST")
+    print("=" * 80)
+
+    analyzer = EnhancedLegalQueryAnalyzer()
+    queries = [
+        "punishment for cheating and criminal breach of trust",
+        "Arbitral award set aside by the court",
+        "appeal against the decree of a civil court",
+        "sentence for dangerous offenders",
+        "assault or criminal force to a woman",
+        "no such words here",
+    ]
+    for query in queries:
+        expected = _scan_main_db(analyzer, query)
+        assert analyzer.search_legal_sections(query)["relevant_sections"] == expected, query
+        print(f"  [PASS] {len(expected):3} sections: {query}")
+
+
+def test_relevance_rule_on_fixed_sections():
+    print("=" * 80)
+    print("QUERY ANALYZER RELEVANCE RULE TEST")
+    print("=" * 80)
+
+    analyzer = EnhancedLegalQueryAnalyzer()
+    analyzer.main_db = {
+        "ipc.json": {"key_sections": {"property": {
+            "378": "Theft of movable property",
+            "415": "Cheating by deception",
+            "420": "Cheating and dishonestly inducing delivery of property",
+            "421": "Dishonest removal of property",
+        }}},
+        "bns.json": {"structure": {"body": {
+            "115": "Voluntarily causing hurt",
+            "131": "Punishment for assault",
+        }}},
+    }
+    analyzer.build_section_index()
+
+    def found(query):
+        sections = analyzer.search_legal_sections(query)["relevant_sections"]
+        return [(section["act"], section["section_number"]) for section in sections]
+
+    # Two keywords are needed; one is not enough
+    assert found("cheating about property") == [("IPC", "420")]
+    assert found("cheating") == []
+    # A priority term shared with the text is enough on its own
+    assert found("ASSAULT") == [("BNS", "131")]
+    # Keywords match inside words: "dishonest" counts for "dishonestly"
+    assert found("assault by dishonest removal of property") == [("IPC", "420"), ("IPC", "421"), ("BNS", "131")]
+    for query in ("cheating about property", "cheating", "assault", "assault by dishonest removal of property"):
+        expected = _scan_main_db(analyzer, query)
+        assert [(s["act"], s["section_number"]) for s in expected] == found(query), query
+    print("  [PASS] Indexed search applies the relevance rule")
+
+
+def test_find_sections_by_numbers_matches_file_scan():
+    print("=" * 80)
+    print("QUERY ANALYZER SECTION NUMBER TEST")
+    print("=" * 80)
+
+    analyzer = EnhancedLegalQueryAnalyzer()
+    numbers = ['63', '302', '375', '498A']
+    expected = []
+    for data in analyzer.main_db.values():
+        if not isinstance(data, dict):
+            continue
+        for container, act in (("key_sections", "IPC"), ("structure", "BNS")):
+            if container in data:
+                for category, sections in data[container].items():
+                    if isinstance(sections, dict):
+                        expected.extend((act, num) for num in sections if num in numbers)
+                break
+
+    found = analyzer.find_sections_by_numbers(numbers, "test")
+    assert [(section["act"], section["section_number"]) for section in found] == expected
+    assert analyzer.find_sections_by_numbers([], "test") == []
+    print(f"  [PASS] {len(found)} sections found by number")
+
+
+def test_analysis_cache():
+    print("=" * 80)
+    print("QUERY ANALYZER CACHE TEST")
+    print("=" * 80)
+
+    analyzer = EnhancedLegalQueryAnalyzer()
+    query = "What is the punishment for Theft?"
+    first = analyzer.analyze_legal_query(query)
+    again = analyzer.analyze_legal_query("  what is the punishment for theft?  ")
+    assert analyzer._cached_analysis.cache_info().hits == 1
+
+    # Same analysis, reported against the query as asked
+    assert first["query"] == query
+    assert again["query"] == "  what is the punishment for theft?  "
+    assert {**again, "query": query} == first
+    assert first["legal_sections"] == analyzer.search_legal_sections(query)
+
+    # Editing a returned analysis does not leak into later results
+    first["legal_sections"]["relevant_sections"].append({"act": "EDITED"})
+    first["recommendations"].clear()
+    third = analyzer.analyze_legal_query(query)
+    assert third == {**again, "query": query}
+    assert third["legal_sections"] == analyzer.search_legal_sections(query)
+
+    analyzer.load_databases()
+    assert analyzer._cached_analysis.cache_info().currsize == 0
+    print("  [PASS] Normalized queries served from cache")
+
+
+if __name__ == "__main__":
+    test_indexed_search_matches_file_scan()
+    test_relevance_rule_on_fixed_sections()
+    test_find_sections_by_numbers_matches_file_scan()
+    test_analysis_cache()
@@ -1,6 +1,12 @@
 import requests
 import json
 
+BASE_URL = 'http://localhost:8000'
+
+def _fetch_nonce(session):
+    """Get a fresh single-use nonce over the shared keep-alive session."""
+    return session.get(f'{BASE_URL}/debug/generate-nonce').json()['nonce']
+
 def validate_schemas():
     """Validate that all schemas are correctly defined and working."""
     
@@ -50,17 +56,17 @@ def validate_schemas():
     ]
     
     all_valid = True
+    session = requests.Session()
     
     for test_case in test_cases:
         print(f"Testing {test_case['name']}...")
         
         # Get fresh nonce
-        nonce_response = requests.get('http://localhost:8000/debug/generate-nonce')
-        nonce = nonce_response.json()['nonce']
+        nonce = _fetch_nonce(session)
         
         # Send request
-        url = f"http://localhost:8000/nyaya/{test_case['endpoint']}?nonce={nonce}"
-        response = requests.post(url, json=test_case['payload'])
+        url = f"{BASE_URL}/nyaya/{test_case['endpoint']}?nonce={nonce}"
+        response = session.post(url, json=test_case['payload'])
         
         if response.status_code == 200:
             print(f"  ✓ Valid - Status {response.status_code}")
@@ -114,12 +120,11 @@ def validate_schemas():
         print(f"Testing {invalid_case['name']}...")
         
         # Get fresh nonce
-        nonce_response = requests.get('http://localhost:8000/debug/generate-nonce')
-        nonce = nonce_response.json()['nonce']
+        nonce = _fetch_nonce(session)
         
         # Send invalid request
-        url = f"http://localhost:8000/nyaya/{invalid_case['endpoint']}?nonce={nonce}"
-        response = requests.post(url, json=invalid_case['payload'])
+        url = f"{BASE_URL}/nyaya/{invalid_case['endpoint']}?nonce={nonce}"
+        response = session.post(url, json=invalid_case['payload'])
         
         if response.status_code == 422:
             print(f"  ✓ Correctly returned 422 - Validation working")
@@ -129,6 +134,8 @@ def validate_schemas():
         
         print()
     
+    session.close()
+    
     print("=== FINAL RESULT ===")
     if all_valid and all_422_correct:
         print("✓ ALL SCHEMAS ARE CORRECTLY DEFINED AND WORKING PROPERLY")